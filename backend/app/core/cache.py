@@ -0,0 +1,148 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from pydantic import BaseModel
+from app.core import metrics
+from app.core.config import settings
+from app.utils.single_flight import SingleFlight
+
+# A single value larger than this share of the budget is served but not kept
+MAX_ENTRY_FRACTION = 0.25
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate memory footprint of a cached value in bytes: sys.getsizeof
+    over containers, pydantic models and their contents, each object
+    counted once.
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, BaseModel):
+            stack.append(obj.__dict__)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+def is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (list, dict, tuple, set)) and not value)
+
+class Namespace:
+    """
+    Per-namespace policy: ttl for values, negative_ttl for empty results
+    (None or an empty container; 0 means they are not cached).
+    """
+
+    def __init__(self, name: str, ttl: float, negative_ttl: float = 0):
+        self.name = name
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+class TieredCache:
+    """
+    Read-through cache: an in-process LRU tier, bounded in bytes, in front
+    of a slower tier (Mongo) reached through the loader passed to
+    get_or_load. Concurrent misses for the same key share one load.
+
+    Values are shared between callers and must be treated as read-only.
+    The tier is per process: writers invalidate their own process, other
+    workers see the change once the namespace ttl expires.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.namespaces: Dict[str, Namespace] = {}
+        # (namespace, key) -> (value, expires_at, size)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float, int]]" = OrderedDict()
+        self._flight = SingleFlight("tiered_cache")
+
+    def namespace(self, name: str, ttl: float, negative_ttl: float = 0) -> Namespace:
+        self.namespaces[name] = Namespace(name, ttl, negative_ttl)
+        return self.namespaces[name]
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        """
+        (found, value) from the in-process tier, without loading.
+        """
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return False, None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove((namespace, key))
+            return False, None
+        self._entries.move_to_end((namespace, key))
+        return True, value
+
+    def set(self, namespace: str, key: str, value: Any) -> None:
+        policy = self.namespaces[namespace]
+        ttl = policy.negative_ttl if is_empty(value) else policy.ttl
+        if ttl <= 0:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes * MAX_ENTRY_FRACTION:
+            metrics.increment(f"cache.too_large.{namespace}")
+            return
+
+        self._remove((namespace, key))
+        self._entries[(namespace, key)] = (value, time.monotonic() + ttl, size)
+        self.size += size
+        while self.size > self.max_bytes and self._entries:
+            evicted = next(iter(self._entries))
+            self._remove(evicted)
+            metrics.increment(f"cache.evictions.{evicted[0]}")
+        metrics.set_gauge("cache.bytes", self.size)
+        metrics.set_gauge("cache.entries", len(self._entries))
+
+    async def get_or_load(self, namespace: str, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Value from the in-process tier, or from loader() (then kept
+        according to the namespace policy).
+        """
+        if not settings.HOT_CACHE_ENABLED:
+            return await loader()
+
+        found, value = self.get(namespace, key)
+        if found:
+            metrics.increment(f"cache.{'negative_hits' if is_empty(value) else 'hits'}.{namespace}")
+            return value
+
+        metrics.increment(f"cache.misses.{namespace}")
+
+        async def load():
+            value = await loader()
+            self.set(namespace, key, value)
+            return value
+
+        return await self._flight.do(f"{namespace}:{key}", load)
+
+    def invalidate(self, namespace: str, prefix: str = "") -> None:
+        """
+        Drop the namespace's keys starting with prefix (all keys by default).
+        """
+        for entry_key in [k for k in self._entries if k[0] == namespace and k[1].startswith(prefix)]:
+            self._remove(entry_key)
+        metrics.set_gauge("cache.bytes", self.size)
+        metrics.set_gauge("cache.entries", len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def _remove(self, entry_key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+hot_cache = TieredCache(settings.HOT_CACHE_MAX_BYTES)
@@ -3,11 +3,50 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     RAPIDAPI_KEY: str = ""
     RAPIDAPI_HOST: str = ""
+    # JSearch calls allowed per UTC day / month; 0 = track only
+    RAPIDAPI_DAILY_QUOTA: int = 0
+    RAPIDAPI_MONTHLY_QUOTA: int = 0
     MONGO_DETAILS: str = "mongodb://localhost:27017"
     LLM_PROVIDER: str = "openai"
     OPENAI_API_KEY: str = ""
     GEMINI_API_KEY: str = ""
 
+    # Shared outbound HTTP client (job sources)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = False  # needs the optional "h2" package
+
+    # Run the job ingestion scheduler inside the API process. Set to false
+    # when running python -m app.services.ingestion as a separate worker.
+    # Job runs take a Mongo lease, so N workers still run each job once
+    # per interval.
+    INGESTION_IN_PROCESS: bool = True
+
+    # Coordinate hybrid cache refreshes across API workers via a Mongo lease
+    CACHE_LEASES_ENABLED: bool = False
+
+    # Latency budget for the hybrid source fan-out; late sources backfill the cache
+    HYBRID_DEADLINE_SECONDS: float = 5.0
+
+    # JSearch pages fetched per query (each page is one billed request)
+    JSEARCH_MAX_PAGES: int = 3
+    JSEARCH_PAGE_CONCURRENCY: int = 3
+
+    # zlib-compress source payloads (raw_data) in job_raw_payloads
+    RAW_PAYLOAD_COMPRESSION: bool = True
+
+    # Create missing indexes at startup; when false they are only reported
+    CREATE_INDEXES_ON_STARTUP: bool = True
+
+    # In-process tier of the read-through cache (app.core.cache), in bytes
+    HOT_CACHE_ENABLED: bool = True
+    HOT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # HTML parser for scraped pages: "auto" (fastest installed), "lxml" or "bs4"
+    HTML_PARSER_BACKEND: str = "auto"
+
     class Config:
         env_file = ".env"
         extra = "ignore"
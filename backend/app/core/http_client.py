@@ -0,0 +1,151 @@
+import asyncio
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from app.core.config import settings
+from app.core import metrics, resilience
+
+# Timeout profiles per job source. Scrapers download whole feeds/pages and
+# get more read time than the JSON API.
+SOURCE_TIMEOUTS: Dict[str, httpx.Timeout] = {
+    "jsearch": httpx.Timeout(10.0, connect=5.0),
+    "remoteok": httpx.Timeout(15.0, connect=5.0),
+    "wwr": httpx.Timeout(15.0, connect=5.0),
+    "hn": httpx.Timeout(15.0, connect=5.0),
+}
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+_client: Optional[httpx.AsyncClient] = None
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+_in_flight: Dict[str, int] = {}
+
+def _create_client() -> httpx.AsyncClient:
+    http2 = settings.HTTP2_ENABLED
+    if http2 and importlib.util.find_spec("h2") is None:
+        print("WARNING: HTTP2_ENABLED is set but the 'h2' package is not installed, using HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(limits=limits, http2=http2, timeout=DEFAULT_TIMEOUT, follow_redirects=True)
+
+async def start_http_client() -> httpx.AsyncClient:
+    """
+    Create the application-scoped client. Called from the FastAPI lifespan.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    _host_semaphores.clear()
+    _in_flight.clear()
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared client. Scripts that call the job sources outside the
+    app (debug_*.py, verify_*.py) get one lazily.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
+
+def _host_semaphore(host: str) -> asyncio.Semaphore:
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.HTTP_MAX_CONNECTIONS_PER_HOST)
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+@asynccontextmanager
+async def stream(source: str, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """
+    Send a request through the shared client on behalf of a job source and
+    yield the response before its body is read (use response.aiter_bytes()).
+
+    Applies the source's timeout profile and the per-host connection limit,
+    and records request, connection reuse and pool saturation metrics.
+    Raises resilience.SourceUnavailable without touching the network when
+    the source's breaker is open, it is rate limited or out of quota.
+    """
+    trial, charged = await resilience.before_request(source)
+
+    # Set once the breaker has heard about this request
+    recorded = False
+    try:
+        client = get_http_client()
+        host = urlsplit(url).hostname or "unknown"
+        kwargs.setdefault("timeout", SOURCE_TIMEOUTS.get(source, DEFAULT_TIMEOUT))
+
+        opened = False
+
+        async def trace(event_name: str, info: dict):
+            nonlocal opened
+            if event_name == "connection.connect_tcp.complete":
+                opened = True
+
+        extensions = kwargs.pop("extensions", {})
+        extensions["trace"] = trace
+
+        semaphore = _host_semaphore(host)
+        if semaphore.locked():
+            # Every slot for this host is busy, we are queueing
+            metrics.increment(f"http.pool_waits.{host}")
+
+        # The host slot is held until the body has been consumed
+        async with semaphore:
+            _in_flight[host] = _in_flight.get(host, 0) + 1
+            metrics.set_gauge(f"http.in_flight.{host}", _in_flight[host])
+            metrics.increment(f"http.requests.{source}")
+            responded = False
+            try:
+                async with client.stream(method, url, extensions=extensions, **kwargs) as response:
+                    responded = True
+                    # Server errors and throttling count towards opening the breaker
+                    resilience.record_result(source, success=response.status_code < 500 and response.status_code != 429)
+                    recorded = True
+                    if opened:
+                        metrics.increment(f"http.connections_opened.{source}")
+                    else:
+                        metrics.increment(f"http.connections_reused.{source}")
+                    yield response
+            except Exception as e:
+                # Errors raised by the caller while handling the body are not the source's fault
+                if not responded or isinstance(e, httpx.TransportError):
+                    metrics.increment(f"http.errors.{source}")
+                    resilience.record_result(source, success=False)
+                    recorded = True
+                if not responded and isinstance(e, httpx.TransportError):
+                    # The source never answered, so the call was not billed
+                    await resilience.refund_quota(source, charged)
+                raise
+            finally:
+                _in_flight[host] -= 1
+                metrics.set_gauge(f"http.in_flight.{host}", _in_flight[host])
+    finally:
+        if trial and not recorded:
+            # Cancelled or failed before the source answered: the half-open
+            # trial must not stay claimed
+            resilience.release_trial(source)
+
+async def request(source: str, method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Same as stream(), with the body read into memory.
+    """
+    async with stream(source, method, url, **kwargs) as response:
+        await response.aread()
+    return response
+
+async def get(source: str, url: str, **kwargs) -> httpx.Response:
+    return await request(source, "GET", url, **kwargs)
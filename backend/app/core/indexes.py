@@ -0,0 +1,153 @@
+import asyncio
+import sys
+from typing import Dict, List
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from app.database import database
+from app.services.job_sources import api_jobs, deduplicate, feed_cache, job_store, merge_jobs
+
+DAY = 24 * 3600
+
+# Declarative index set, created idempotently at startup (ensure_indexes).
+# Names are explicit so a changed definition shows up as a conflict instead
+# of silently creating a second index.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users_collection": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "resumes": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+    "resume_texts": [
+        IndexModel([("user_id", ASCENDING), ("file_path", ASCENDING)], name="user_id_file_path"),
+        # /save deletes a user's texts; these are uploads that were never saved
+        IndexModel([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=7 * DAY),
+    ],
+    "job_tracking": [
+        IndexModel([("user_id", ASCENDING), ("job_id", ASCENDING)], name="user_id_job_id"),
+        # /tracking/list and the dashboard: per-status lists, newest first
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING)],
+            name="user_id_status_updated_at"
+        ),
+    ],
+    api_jobs.CACHE_COLLECTION: [
+        IndexModel([("query_key", ASCENDING), ("_id", ASCENDING)], name="query_key_id"),
+        IndexModel([("query_key", ASCENDING), ("fetched_at", DESCENDING)], name="query_key_fetched_at"),
+        # Only the last refresh of a query is read; abandoned queries expire
+        IndexModel([("fetched_at", ASCENDING)], name="fetched_at_ttl", expireAfterSeconds=7 * DAY),
+    ],
+    merge_jobs.CACHE_COLLECTION: [
+        IndexModel([("query_key", ASCENDING)], name="query_key_unique", unique=True),
+        # Broader entries of a search: same place, fewer tokens, largest first
+        IndexModel(
+            [("location_key", ASCENDING), ("remote", ASCENDING), ("token_count", DESCENDING)],
+            name="refinement_lookup"
+        ),
+        # Entries past the stale window are never served
+        IndexModel([("fetched_at", ASCENDING)], name="fetched_at_ttl", expireAfterSeconds=merge_jobs.STALE_DURATION_HOURS * 3600),
+    ],
+    merge_jobs.QUERY_STATS_COLLECTION: [
+        IndexModel([("query_key", ASCENDING)], name="query_key_unique", unique=True),
+        IndexModel([("last_requested_at", ASCENDING)], name="last_requested_at_ttl", expireAfterSeconds=30 * DAY),
+    ],
+    merge_jobs.LEASE_COLLECTION: [
+        # Leases of crashed workers are cleaned up once expired
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    job_store.JOBS_COLLECTION: [
+        IndexModel([("job_id", ASCENDING)], name="job_id"),
+        IndexModel([("last_seen_at", ASCENDING)], name="last_seen_at_ttl", expireAfterSeconds=30 * DAY),
+    ],
+    job_store.RAW_COLLECTION: [
+        IndexModel([("job_id", ASCENDING), ("stored_at", DESCENDING)], name="job_id_stored_at"),
+        IndexModel([("stored_at", ASCENDING)], name="stored_at_ttl", expireAfterSeconds=30 * DAY),
+    ],
+    deduplicate.SIGNATURE_COLLECTION: [
+        IndexModel([("bands", ASCENDING)], name="bands"),
+        # Same horizon as the job store: reposts are matched against jobs
+        # seen within the last 30 days
+        IndexModel([("seen_at", ASCENDING)], name="seen_at_ttl", expireAfterSeconds=30 * DAY),
+    ],
+    feed_cache.FEED_COLLECTION: [
+        IndexModel([("fetched_at", ASCENDING)], name="fetched_at_ttl", expireAfterSeconds=7 * DAY),
+    ],
+}
+
+# Options that make two indexes on the same keys different
+COMPARED_OPTIONS = ("unique", "expireAfterSeconds", "sparse")
+
+def _spec(model: IndexModel) -> dict:
+    document = dict(model.document)
+    return {
+        "key": list(document["key"].items()),
+        **{option: document[option] for option in COMPARED_OPTIONS if option in document}
+    }
+
+def _existing_spec(info: dict) -> dict:
+    return {
+        "key": [(field, int(direction) if isinstance(direction, (int, float)) else direction) for field, direction in info["key"]],
+        **{option: info[option] for option in COMPARED_OPTIONS if option in info}
+    }
+
+async def check_indexes() -> Dict[str, List[str]]:
+    """
+    Compare INDEXES with what the database has. Returns
+    {"missing": [...], "conflicts": [...]} as "collection.index" strings,
+    with the difference for conflicts. Extra indexes are left alone.
+    """
+    report = {"missing": [], "conflicts": []}
+    for collection_name, models in INDEXES.items():
+        existing = await database.get_collection(collection_name).index_information()
+        by_key = {tuple(_existing_spec(info)["key"]): name for name, info in existing.items()}
+        for model in models:
+            spec = _spec(model)
+            name = model.document["name"]
+            if name in existing:
+                current = _existing_spec(existing[name])
+                if current != spec:
+                    report["conflicts"].append(f"{collection_name}.{name}: have {current}, want {spec}")
+            elif tuple(spec["key"]) in by_key:
+                other = by_key[tuple(spec["key"])]
+                report["conflicts"].append(f"{collection_name}.{name}: same keys already indexed as {other}")
+            else:
+                report["missing"].append(f"{collection_name}.{name}")
+    return report
+
+async def ensure_indexes(create: bool = True) -> Dict[str, List[str]]:
+    """
+    Create missing indexes (unless create is False) and report the rest.
+    Conflicting indexes are never dropped: they need a migration.
+    """
+    report = await check_indexes()
+    if create:
+        created, failed = [], []
+        for entry in report["missing"]:
+            collection_name, name = entry.split(".", 1)
+            model = next(m for m in INDEXES[collection_name] if m.document["name"] == name)
+            try:
+                await database.get_collection(collection_name).create_indexes([model])
+                created.append(entry)
+            except OperationFailure as e:
+                # e.g. duplicate emails stop the unique index from building
+                failed.append(f"{entry}: {e}")
+        report = {"created": created, "missing": failed, "conflicts": report["conflicts"]}
+
+    for entry in report["missing"]:
+        print(f"Index missing: {entry}")
+    for entry in report["conflicts"]:
+        print(f"Index conflict: {entry}")
+    return report
+
+async def report_indexes() -> None:
+    """
+    Startup check on its own: python -m app.core.indexes [--create]
+    Exits non-zero when indexes are missing or conflicting.
+    """
+    report = await ensure_indexes(create="--create" in sys.argv)
+    if report["missing"] or report["conflicts"]:
+        sys.exit(1)
+    print("All indexes present.")
+
+if __name__ == "__main__":
+    asyncio.run(report_indexes())
@@ -0,0 +1,22 @@
+from collections import defaultdict
+from typing import Dict
+
+# Minimal in-process metrics registry. Counters only go up, gauges are set
+# to the latest value. Exposed as JSON on GET /metrics.
+_counters: Dict[str, float] = defaultdict(float)
+_gauges: Dict[str, float] = {}
+
+def increment(name: str, value: float = 1) -> None:
+    _counters[name] += value
+
+def set_gauge(name: str, value: float) -> None:
+    _gauges[name] = value
+
+def get_counter(name: str) -> float:
+    return _counters.get(name, 0)
+
+def snapshot() -> dict:
+    return {
+        "counters": dict(sorted(_counters.items())),
+        "gauges": dict(sorted(_gauges.items())),
+    }
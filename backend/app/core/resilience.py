@@ -0,0 +1,221 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.core import metrics
+from app.core.config import settings
+from app.database import database
+
+QUOTA_COLLECTION = "api_quota"
+
+# Per-source limits. rate is requests/second refilled into a bucket of
+# size burst; the breaker opens after failure_threshold consecutive
+# failures and lets one trial request through after cooldown seconds.
+SOURCE_POLICIES = {
+    "jsearch": {"failure_threshold": 3, "cooldown": 120, "rate": 2.0, "burst": 5},
+    "remoteok": {"failure_threshold": 3, "cooldown": 300, "rate": 0.5, "burst": 2},
+    "wwr": {"failure_threshold": 3, "cooldown": 300, "rate": 1.0, "burst": 5},
+    "hn": {"failure_threshold": 3, "cooldown": 300, "rate": 0.5, "burst": 2},
+}
+DEFAULT_POLICY = {"failure_threshold": 5, "cooldown": 60, "rate": 5.0, "burst": 10}
+
+# Sources billed per call against the RapidAPI plan
+METERED_SOURCES = {"jsearch"}
+
+class SourceUnavailable(Exception):
+    """
+    Raised instead of sending a request when the source is known to be
+    down, throttled locally, or out of paid quota.
+    """
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+    def ready(self) -> bool:
+        """
+        Whether a request could be sent now, without claiming the trial.
+        """
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = self.HALF_OPEN
+        return self.state == self.HALF_OPEN and not self.trial_in_flight
+
+    def allow(self) -> bool:
+        if not self.ready():
+            return False
+        if self.state == self.HALF_OPEN:
+            # Let a single trial request probe the source
+            self.trial_in_flight = True
+        return True
+
+    def release_trial(self) -> None:
+        # The trial was never answered (e.g. cancelled): let the next one probe
+        self.trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+class QuotaLedger:
+    """
+    Counts paid API calls per day and per month in Mongo (shared by all
+    workers). Limits of 0 mean "track only".
+    """
+
+    def __init__(self, source: str, daily_limit: int, monthly_limit: int):
+        self.source = source
+        self.daily_limit = daily_limit
+        self.monthly_limit = monthly_limit
+
+    def _periods(self) -> Dict[str, int]:
+        now = datetime.utcnow()
+        return {
+            f"{self.source}:day:{now:%Y-%m-%d}": self.daily_limit,
+            f"{self.source}:month:{now:%Y-%m}": self.monthly_limit,
+        }
+
+    async def try_consume(self) -> Optional[List[str]]:
+        """
+        Take one call from every period. Returns the keys charged, to be
+        handed to refund() if the call is not made, or None when a period
+        is used up.
+        """
+        collection = database.get_collection(QUOTA_COLLECTION)
+        charged = []
+        counts = {}
+        for key, limit in self._periods().items():
+            # The limit is part of the filter: a full period does not match,
+            # the upsert then collides with the existing _id and nothing is taken
+            query = {"_id": key, "count": {"$lt": limit}} if limit else {"_id": key}
+            try:
+                doc = await collection.find_one_and_update(
+                    query,
+                    {"$inc": {"count": 1}},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+            except DuplicateKeyError:
+                await self.refund(charged)
+                return None
+            charged.append(key)
+            counts[key] = doc["count"]
+
+        for key, count in counts.items():
+            period = key.split(":")[1]
+            metrics.set_gauge(f"quota.{self.source}.{period}", count)
+        return charged
+
+    async def refund(self, keys: List[str]) -> None:
+        """
+        Give back a call taken by try_consume that was not made. keys are
+        the ones try_consume returned, so a call that straddles midnight is
+        refunded to the day it was charged to.
+        """
+        collection = database.get_collection(QUOTA_COLLECTION)
+        for key in keys:
+            await collection.update_one({"_id": key}, {"$inc": {"count": -1}})
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_buckets: Dict[str, TokenBucket] = {}
+_ledgers: Dict[str, QuotaLedger] = {}
+
+BREAKER_STATE_VALUES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+def get_breaker(source: str) -> CircuitBreaker:
+    if source not in _breakers:
+        policy = SOURCE_POLICIES.get(source, DEFAULT_POLICY)
+        _breakers[source] = CircuitBreaker(policy["failure_threshold"], policy["cooldown"])
+    return _breakers[source]
+
+def get_bucket(source: str) -> TokenBucket:
+    if source not in _buckets:
+        policy = SOURCE_POLICIES.get(source, DEFAULT_POLICY)
+        _buckets[source] = TokenBucket(policy["rate"], policy["burst"])
+    return _buckets[source]
+
+def get_ledger(source: str) -> QuotaLedger:
+    if source not in _ledgers:
+        _ledgers[source] = QuotaLedger(source, settings.RAPIDAPI_DAILY_QUOTA, settings.RAPIDAPI_MONTHLY_QUOTA)
+    return _ledgers[source]
+
+def _skip(source: str, reason: str):
+    metrics.increment(f"resilience.skipped.{source}.{reason}")
+    raise SourceUnavailable(f"{source} skipped: {reason}")
+
+async def before_request(source: str) -> Tuple[bool, List[str]]:
+    """
+    Raise SourceUnavailable if the request should not be sent. A half-open
+    breaker's trial is claimed last, once the request is sure to go out.
+    Returns (trial, charged). trial is True when this request is that
+    trial: the caller must then record_result() or release_trial().
+    charged lists the quota keys taken, for refund_quota() if the request
+    never reaches the source.
+    """
+    breaker = get_breaker(source)
+    if not breaker.ready():
+        _skip(source, "circuit_open")
+    if not get_bucket(source).try_acquire():
+        _skip(source, "rate_limited")
+    charged = []
+    if source in METERED_SOURCES:
+        charged = await get_ledger(source).try_consume()
+        if charged is None:
+            _skip(source, "quota_exhausted")
+    if not breaker.allow():
+        # Another request took the trial while the ledger was consulted
+        await refund_quota(source, charged)
+        _skip(source, "circuit_open")
+    metrics.set_gauge(f"resilience.breaker_state.{source}", BREAKER_STATE_VALUES[breaker.state])
+    return breaker.state == CircuitBreaker.HALF_OPEN, charged
+
+async def refund_quota(source: str, charged: List[str]) -> None:
+    if charged:
+        await get_ledger(source).refund(charged)
+
+def release_trial(source: str) -> None:
+    get_breaker(source).release_trial()
+
+def record_result(source: str, success: bool) -> None:
+    breaker = get_breaker(source)
+    if success:
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+        metrics.increment(f"resilience.failures.{source}")
+    metrics.set_gauge(f"resilience.breaker_state.{source}", BREAKER_STATE_VALUES[breaker.state])
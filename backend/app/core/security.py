@@ -4,6 +4,7 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from app.core.cache import hot_cache
 from app.database import user_collection, user_helper
 
 # SECRET_KEY should be in .env in production
@@ -13,6 +14,11 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Every authenticated request looks its user up; unknown emails are kept
+# briefly too, so a stale token cannot keep hitting Mongo
+USERS_CACHE_NAMESPACE = "users"
+hot_cache.namespace(USERS_CACHE_NAMESPACE, ttl=60, negative_ttl=15)
+
 def verify_password(plain_password, hashed_password):
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
@@ -42,7 +48,11 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = await user_collection.find_one({"email": email})
+    user = await hot_cache.get_or_load(USERS_CACHE_NAMESPACE, email, lambda: load_user(email))
     if user is None:
         raise credentials_exception
-    return user_helper(user)
+    return dict(user)
+
+async def load_user(email: str) -> Optional[dict]:
+    user = await user_collection.find_one({"email": email})
+    return user_helper(user) if user else None
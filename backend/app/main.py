@@ -1,8 +1,42 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import auth, resume, jobs, recommend, job_tracking, dashboard, hybrid_jobs
+from app.core import metrics
+from app.core.config import settings
+from app.core.http_client import start_http_client, close_http_client
+from app.core.indexes import ensure_indexes
+from app.services.resume_reparser import reparse_stale_resumes
+from app.services.ingestion import create_scheduler
 
-app = FastAPI()
+async def bootstrap_indexes() -> None:
+    try:
+        report = await ensure_indexes(create=settings.CREATE_INDEXES_ON_STARTUP)
+        print(f"Indexes: {len(report.get('created', []))} created, {len(report['missing'])} missing, {len(report['conflicts'])} conflicting")
+    except Exception as e:
+        print(f"Index bootstrap failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client shared by all job sources
+    await start_http_client()
+    # Declarative indexes (app.core.indexes), including TTL expiry of caches
+    index_task = asyncio.create_task(bootstrap_indexes())
+    # Bring resumes saved by an older parser up to date without blocking startup
+    reparse_task = asyncio.create_task(reparse_stale_resumes())
+    # Keep feeds and popular queries warm so requests are served from cache
+    scheduler = create_scheduler() if settings.INGESTION_IN_PROCESS else None
+    if scheduler:
+        scheduler.start()
+    yield
+    index_task.cancel()
+    reparse_task.cancel()
+    if scheduler:
+        await scheduler.stop()
+    await close_http_client()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS
 origins = [
@@ -33,3 +67,7 @@ app.include_router(hybrid_jobs.router, prefix="/hybrid-jobs", tags=["hybrid-jobs
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
+
+@app.get("/metrics")
+def read_metrics():
+    return metrics.snapshot()
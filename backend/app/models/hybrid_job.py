@@ -13,7 +13,9 @@ class HybridJob(BaseModel):
     source: str = Field(..., description="Source of the job: api | remoteok | wwr | hn")
     published_at: Optional[datetime] = None
     skills: List[str] = []
-    raw_data: Dict[str, Any] = {}
+    # Original source payload. Kept out of responses and the job store;
+    # stored separately (job_store.save_raw_payloads) and loaded on demand.
+    raw_data: Dict[str, Any] = Field(default_factory=dict, exclude=True)
     fetched_at: datetime = Field(default_factory=datetime.utcnow)
     
     # Matching Engine Fields
@@ -23,8 +25,18 @@ class HybridJob(BaseModel):
     experience_difference: Optional[str] = None
     reason: Optional[str] = None
 
+def job_from_cache(doc: Dict[str, Any]) -> HybridJob:
+    """
+    Rebuild a job from a document we wrote from a validated HybridJob.
+    Skips validation (model_construct); keys that are not fields are dropped.
+    """
+    return HybridJob.model_construct(**doc)
+
 class HybridJobResponse(BaseModel):
     jobs: List[HybridJob]
     external_search_links: Dict[str, str]
     sources_used: List[str]
     total: int
+    # True when some sources missed the latency budget (see missing_sources)
+    partial: bool = False
+    missing_sources: List[str] = []
@@ -2,7 +2,8 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from app.database import user_collection, user_helper
 from app.models.user import UserCreate, User, Token, UserInDB
-from app.core.security import get_password_hash, verify_password, create_access_token, SECRET_KEY, ALGORITHM, get_current_user
+from app.core.cache import hot_cache
+from app.core.security import get_password_hash, verify_password, create_access_token, SECRET_KEY, ALGORITHM, get_current_user, USERS_CACHE_NAMESPACE
 from bson.objectid import ObjectId
 from datetime import timedelta
 
@@ -35,6 +36,8 @@ async def register(user: UserCreate):
         )
     
     new_user = await user_collection.insert_one(user_in_db.dict())
+    # Drop a cached "no such user" for this email
+    hot_cache.invalidate(USERS_CACHE_NAMESPACE, user.email)
     created_user = await user_collection.find_one({"_id": new_user.inserted_id})
     return user_helper(created_user)
 
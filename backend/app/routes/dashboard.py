@@ -15,9 +15,18 @@ from app.models.resume import Resume
 from app.models.job_tracking import JobTracking
 from app.models.job import CachedJob
 from collections import Counter
+from app.core.cache import hot_cache
+from app.services.job_sources.api_jobs import CACHE_COLLECTION, PUBLISHED
 
 router = APIRouter()
 
+# Corpus-wide figures, the same for every user
+HOT_CACHE_NAMESPACE = "dashboard"
+hot_cache.namespace(HOT_CACHE_NAMESPACE, ttl=600, negative_ttl=60)
+
+async def _count_cached_jobs() -> int:
+    return await db[CACHE_COLLECTION].count_documents(PUBLISHED)
+
 @router.get("/summary")
 async def get_dashboard_summary(current_user: User = Depends(get_current_user)):
     try:
@@ -30,7 +39,7 @@ async def get_dashboard_summary(current_user: User = Depends(get_current_user)):
         # Since we don't strictly persist "last search results" per user in a separate collection, 
         # we can count all CachedJobs or just return a placeholder if no search done.
         # Let's count all CachedJobs for now as a simple proxy for "available matches".
-        total_recommended = await db["cached_jobs"].count_documents({})
+        total_recommended = await hot_cache.get_or_load(HOT_CACHE_NAMESPACE, "cached_jobs_count", _count_cached_jobs)
 
         # Tracking Stats
         saved_count = await db["job_tracking"].count_documents({"user_id": user_id, "status": "saved"})
@@ -117,6 +126,26 @@ async def get_dashboard_summary(current_user: User = Depends(get_current_user)):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _market_skills() -> List[Dict[str, Any]]:
+    common_skills = ["Python", "Java", "JavaScript", "React", "Node.js", "SQL", "NoSQL", "AWS", "Docker", "Kubernetes", "TypeScript", "Go", "Rust", "C++", "C#", "HTML", "CSS", "Git", "CI/CD", "Machine Learning", "AI", "FastAPI", "Django", "Flask", "Spring", "Vue", "Angular", "MongoDB", "PostgreSQL", "Redis"]
+    
+    # Fetch a sample of recent jobs to analyze
+    recent_jobs = await db[CACHE_COLLECTION].find(PUBLISHED, {"raw_data": 0}).limit(50).to_list(length=50)
+    
+    skill_counts = Counter()
+    for job in recent_jobs:
+        text = (job.get("description", "") + " " + job.get("title", "")).lower()
+        for skill in common_skills:
+            import re
+            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
+            if skill.lower() == "java":
+                pattern = r'\bjava\b(?!\s*-?script)'
+            
+            if re.search(pattern, text):
+                skill_counts[skill] += 1
+                
+    return [{"skill": skill, "frequency": count} for skill, count in skill_counts.most_common(10)]
+
 @router.get("/skills")
 async def get_skill_analytics(current_user: User = Depends(get_current_user)):
     try:
@@ -138,24 +167,7 @@ async def get_skill_analytics(current_user: User = Depends(get_current_user)):
         # BETTER APPROACH: Let's assume we have some extracted skills in jobs or we just look for common keywords.
         # For now, I will use a simple predefined list of common tech skills and count their occurrence in a sample of job descriptions.
         
-        common_skills = ["Python", "Java", "JavaScript", "React", "Node.js", "SQL", "NoSQL", "AWS", "Docker", "Kubernetes", "TypeScript", "Go", "Rust", "C++", "C#", "HTML", "CSS", "Git", "CI/CD", "Machine Learning", "AI", "FastAPI", "Django", "Flask", "Spring", "Vue", "Angular", "MongoDB", "PostgreSQL", "Redis"]
-        
-        # Fetch a sample of recent jobs to analyze
-        recent_jobs = await db["cached_jobs"].find({}).limit(50).to_list(length=50)
-        
-        skill_counts = Counter()
-        for job in recent_jobs:
-            text = (job.get("description", "") + " " + job.get("title", "")).lower()
-            for skill in common_skills:
-                import re
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if skill.lower() == "java":
-                    pattern = r'\bjava\b(?!\s*-?script)'
-                
-                if re.search(pattern, text):
-                    skill_counts[skill] += 1
-                    
-        recommended_skills_data = [{"skill": skill, "frequency": count} for skill, count in skill_counts.most_common(10)]
+        recommended_skills_data = await hot_cache.get_or_load(HOT_CACHE_NAMESPACE, "market_skills", _market_skills)
         
         # Missing Skills
         # Skills in recommended (top 10) that are NOT in user_skills
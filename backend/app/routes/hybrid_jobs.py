@@ -1,39 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from typing import List, Optional
 from app.database import database
 from app.models.user import User
 from app.core.security import get_current_user
 from app.models.resume import Resume
 from app.models.hybrid_job import HybridJob, HybridJobResponse
-from app.services.job_sources.merge_jobs import get_hybrid_jobs
+from app.services.job_sources.merge_jobs import get_hybrid_jobs, stream_hybrid_jobs
 from app.services.job_sources.search_links import generate_search_links
+from app.services.job_sources.job_store import find_jobs, load_raw_payload
 from app.services.matching_engine import calculate_match_score, rank_jobs
 from app.utils.text_similarity import extract_years_of_experience
+from app.utils.streaming import EXPORT_FORMATS, STREAM_FORMATS, event_stream_response, export_response, parse_fields
 import re
 
 router = APIRouter()
 
-@router.get("/recommended", response_model=HybridJobResponse)
-async def get_recommended_hybrid_jobs(
-    page: int = Query(1, ge=1),
-    limit: int = Query(10, ge=1, le=50),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Get recommended jobs from hybrid sources (API + Scrapers) based on user profile.
-    Strictly filters by Experience Level and Skills.
-    """
-    # 1. Fetch User Resume
+# Fresher exclusions
+SENIOR_PATTERN = re.compile(r'\b(Senior|Sr\.|Lead|Principal|Manager|Architect|Head|Director|VP)\b', re.IGNORECASE)
+# Experienced exclusions (> 3 years)
+JUNIOR_PATTERN = re.compile(r'\b(Intern|Internship|Junior|Jr\.|Entry Level|Trainee)\b', re.IGNORECASE)
+
+FALLBACK_QUERY = "Software Engineer"
+# Below this many jobs for the user's own query, the fallback query is added
+MIN_RECOMMENDED_JOBS = 5
+
+async def _load_resume(current_user: User) -> Resume:
     resume_data = await database.get_collection("resumes").find_one({"user_id": current_user["id"]})
     if not resume_data:
         raise HTTPException(status_code=404, detail="Resume not found. Please upload a resume first.")
     
     if "_id" in resume_data:
         resume_data["id"] = str(resume_data["_id"])
-    resume = Resume(**resume_data)
-    
-    # 2. Determine Search Query from Resume
-    query = "Software Engineer" 
+    return Resume(**resume_data)
+
+def _search_profile(resume: Resume) -> tuple:
+    """
+    (query, location, experience years) used to recommend jobs for a resume.
+    """
+    query = FALLBACK_QUERY
     if resume.skills:
         query = resume.skills[0] 
     
@@ -44,85 +48,89 @@ async def get_recommended_hybrid_jobs(
     if resume.experience:
         # Extract years from experience descriptions
         # experience is List[str]
-        exp_texts = resume.experience
-        user_experience_years = extract_years_of_experience(exp_texts)
+        user_experience_years = extract_years_of_experience(resume.experience)
+
+    return query, location, user_experience_years
+
+def _is_relevant(job: HybridJob, user_experience_years: float, user_skills_lower: set) -> bool:
+    title = job.title
+    text_to_check = (title + " " + job.description).lower()
+    
+    # A. Experience Filter
+    if user_experience_years < 1.5:
+        # User is Fresher/Junior
+        if SENIOR_PATTERN.search(title):
+            return False # Skip senior roles
+    elif user_experience_years > 3.0:
+        # User is Experienced
+        if JUNIOR_PATTERN.search(title):
+            return False # Skip junior roles
+            
+    # B. Skill Relevance Filter
+    # Job MUST contain at least one user skill to be relevant
+    # (Prevent "Remote" generic marketing jobs for a Developer)
+    if user_skills_lower:
+        # Simple word boundary check
+        return any(re.search(r'\b' + re.escape(skill) + r'\b', text_to_check) for skill in user_skills_lower)
+    return True
+
+def _score(job: HybridJob, resume: Resume) -> Optional[dict]:
+    scored_job = calculate_match_score(job.dict(), resume)
+    if scored_job["match_score"] <= 0:
+        return None
+    scored_job["source"] = job.source
+    scored_job["job_type"] = job.job_type
+    scored_job["published_at"] = job.published_at
+    return scored_job
+
+def _merge_sources(target: List[str], sources: List[str]) -> None:
+    for source in sources:
+        if source not in target:
+            target.append(source)
+
+@router.get("/recommended", response_model=HybridJobResponse)
+async def get_recommended_hybrid_jobs(
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get recommended jobs from hybrid sources (API + Scrapers) based on user profile.
+    Strictly filters by Experience Level and Skills.
+    """
+    # 1. Fetch User Resume
+    resume = await _load_resume(current_user)
+    
+    # 2. Determine Search Query from Resume
+    query, location, user_experience_years = _search_profile(resume)
     
     # 3. Fetch Hybrid Jobs
-    # Fetch broadly by "Software Engineer" if specific skill query might limit "Remote" results too much?
-    # No, stick to skill for relevance, but maybe fetch more to filter down.
-    # Actually, let's fetch based on the top skill, as that's most relevant.
+    # Fetch based on the top skill, as that's most relevant.
     result = await get_hybrid_jobs(query, location, remote=True)
     
     initial_jobs = result["jobs"]
     sources_used = result["sources_used"]
+    missing_sources = list(result["missing_sources"])
     
     # Fallback: If low count, try broader query BUT we will strictly filter results later
-    if len(initial_jobs) < 5 and query.lower() != "software engineer":
+    if len(initial_jobs) < MIN_RECOMMENDED_JOBS and query.lower() != FALLBACK_QUERY.lower():
         print(f"Low job count ({len(initial_jobs)}). Fetching fallback...")
-        fallback_result = await get_hybrid_jobs("Software Engineer", location, remote=True)
+        fallback_result = await get_hybrid_jobs(FALLBACK_QUERY, location, remote=True)
         
         existing_ids = {j.job_id for j in initial_jobs}
         for job in fallback_result["jobs"]:
             if job.job_id not in existing_ids:
                 initial_jobs.append(job)
         
-        for source in fallback_result["sources_used"]:
-             if source not in sources_used and source not in sources_used: # Avoid dupes
-                sources_used.append(source)
+        _merge_sources(sources_used, fallback_result["sources_used"])
+        _merge_sources(missing_sources, fallback_result["missing_sources"])
     
     # 4. Strict Filtering Logic
-    filtered_jobs = []
-    
-    # Prepare exclusions regex
-    # Fresher exclusions
-    senior_pattern = re.compile(r'\b(Senior|Sr\.|Lead|Principal|Manager|Architect|Head|Director|VP)\b', re.IGNORECASE)
-    # Experienced exclusions (> 3 years)
-    junior_pattern = re.compile(r'\b(Intern|Internship|Junior|Jr\.|Entry Level|Trainee)\b', re.IGNORECASE)
-    
     user_skills_lower = {s.lower() for s in (resume.skills or [])}
-    
-    for job in initial_jobs:
-        title = job.title
-        desc = job.description
-        text_to_check = (title + " " + desc).lower()
-        
-        # A. Experience Filter
-        if user_experience_years < 1.5:
-            # User is Fresher/Junior
-            if senior_pattern.search(title):
-                continue # Skip senior roles
-        elif user_experience_years > 3.0:
-            # User is Experienced
-            if junior_pattern.search(title):
-                continue # Skip junior roles
-                
-        # B. Skill Relevance Filter
-        # Job MUST contain at least one user skill to be relevant
-        # (Prevent "Remote" generic marketing jobs for a Developer)
-        if user_skills_lower:
-            has_skill = False
-            for skill in user_skills_lower:
-                # Simple word boundary check
-                if re.search(r'\b' + re.escape(skill) + r'\b', text_to_check):
-                    has_skill = True
-                    break
-            
-            if not has_skill:
-                continue # Skip irrelevant job
-        
-        filtered_jobs.append(job)
+    filtered_jobs = [job for job in initial_jobs if _is_relevant(job, user_experience_years, user_skills_lower)]
 
     # 5. Run Matching Engine (Ranking) on Filtered Jobs
-    scored_jobs = []
-    for job in filtered_jobs:
-        job_dict = job.dict()
-        scored_job = calculate_match_score(job_dict, resume)
-        
-        if scored_job["match_score"] > 0:
-            scored_job["source"] = job.source
-            scored_job["job_type"] = job.job_type
-            scored_job["published_at"] = job.published_at
-            scored_jobs.append(scored_job)
+    scored_jobs = [scored for scored in (_score(job, resume) for job in filtered_jobs) if scored]
             
     # 6. Rank
     ranked_jobs = rank_jobs(scored_jobs, "match")
@@ -139,10 +147,72 @@ async def get_recommended_hybrid_jobs(
         "jobs": final_jobs,
         "external_search_links": external_links,
         "sources_used": sources_used,
-        "total": len(ranked_jobs)
+        "total": len(ranked_jobs),
+        "partial": bool(missing_sources),
+        "missing_sources": missing_sources
     }
 
-@router.get("/search")
+@router.get("/recommended/stream")
+async def stream_recommended_hybrid_jobs(
+    format: str = Query("sse", pattern=STREAM_FORMATS),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Streaming variant of /recommended: filtered, scored jobs are sent as
+    "job" events as each source delivers them (unranked, rank on the
+    client by match_score), followed by one "summary" event.
+    A job event's "replaces" lists job_ids of earlier events it supersedes.
+    """
+    resume = await _load_resume(current_user)
+    query, location, user_experience_years = _search_profile(resume)
+    user_skills_lower = {s.lower() for s in (resume.skills or [])}
+
+    async def events():
+        sources_used: List[str] = []
+        missing_sources: List[str] = []
+        seen_ids = set()
+        sent_ids = set()
+        received = 0
+
+        for is_fallback, search_query in ((False, query), (True, FALLBACK_QUERY)):
+            if is_fallback:
+                if received >= MIN_RECOMMENDED_JOBS or query.lower() == FALLBACK_QUERY.lower():
+                    break
+                print(f"Low job count ({received}). Streaming fallback...")
+
+            async for event in stream_hybrid_jobs(search_query, location, remote=True):
+                if event["event"] == "summary":
+                    _merge_sources(sources_used, event["sources_used"])
+                    _merge_sources(missing_sources, event["missing_sources"])
+                    continue
+
+                job = event["job"]
+                if not is_fallback:
+                    received += 1 - len(event["replaces"])
+                if job.job_id in seen_ids:
+                    continue
+                seen_ids.add(job.job_id)
+
+                if not _is_relevant(job, user_experience_years, user_skills_lower):
+                    continue
+                scored_job = _score(job, resume)
+                if scored_job is None:
+                    continue
+                sent_ids.add(job.job_id)
+                sent_ids.difference_update(event["replaces"])
+                yield "job", {**scored_job, "replaces": event["replaces"]}
+
+        yield "summary", {
+            "external_search_links": generate_search_links(query, location),
+            "sources_used": sources_used,
+            "total": len(sent_ids),
+            "partial": bool(missing_sources),
+            "missing_sources": missing_sources
+        }
+
+    return event_stream_response(events(), format)
+
+@router.get("/search", response_model=HybridJobResponse)
 async def search_hybrid_jobs(
     role: str = Query(..., min_length=1),
     location: str = Query("", min_length=0),
@@ -153,22 +223,78 @@ async def search_hybrid_jobs(
     """
     Search jobs across hybrid sources.
     """
-    result = await get_hybrid_jobs(role, location, remote)
-    jobs = result["jobs"]
-    sources_used = result["sources_used"]
-    
-    # Sort by date (newest first)
-    # jobs are already sorted by date in merge_jobs.py
-    
-    start = (page - 1) * limit
-    end = start + limit
-    final_jobs = jobs[start:end]
+    # Only the requested page is read from the cache
+    result = await get_hybrid_jobs(role, location, remote, skip=(page - 1) * limit, limit=limit)
     
+    # jobs are already sorted by date (newest first) in merge_jobs.py
     external_links = generate_search_links(role, location)
     
-    return {
-        "jobs": final_jobs,
-        "external_search_links": external_links,
-        "sources_used": sources_used,
-        "total": len(jobs)
-    }
+    # Jobs are HybridJob instances already (validated when first stored), so
+    # serialize them directly instead of letting FastAPI validate and
+    # encode the whole response again
+    response = HybridJobResponse.model_construct(
+        jobs=result["jobs"],
+        external_search_links=external_links,
+        sources_used=result["sources_used"],
+        total=result["total"],
+        partial=result["partial"],
+        missing_sources=result["missing_sources"]
+    )
+    return Response(response.model_dump_json(), media_type="application/json")
+
+@router.get("/search/stream")
+async def stream_search_hybrid_jobs(
+    role: str = Query(..., min_length=1),
+    location: str = Query("", min_length=0),
+    remote: bool = Query(False),
+    format: str = Query("sse", pattern=STREAM_FORMATS)
+):
+    """
+    Streaming variant of /search: deduplicated jobs are sent as "job" events
+    as soon as each source delivers them, followed by one "summary" event.
+    A job event's "replaces" lists job_ids of earlier events it supersedes.
+    """
+    async def events():
+        async for event in stream_hybrid_jobs(role, location, remote):
+            if event["event"] == "job":
+                yield "job", {**event["job"].dict(), "replaces": event["replaces"]}
+            else:
+                summary = {k: v for k, v in event.items() if k != "event"}
+                yield "summary", {"external_search_links": generate_search_links(role, location), **summary}
+
+    return event_stream_response(events(), format)
+
+# Fields of the stored corpus that /export can project
+CORPUS_FIELDS = [name for name in HybridJob.model_fields if name != "raw_data"] + ["first_seen_at", "last_seen_at"]
+
+@router.get("/export")
+async def export_corpus(
+    source: Optional[str] = None,
+    format: str = Query("ndjson", pattern=EXPORT_FORMATS),
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream the whole canonical job corpus (optionally one source) as NDJSON
+    or a JSON array; fields is a comma separated subset of CORPUS_FIELDS.
+    """
+    try:
+        projection = parse_fields(fields, CORPUS_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    query = {"source": source} if source else None
+    return export_response(find_jobs(query, projection), format, filename="jobs_corpus")
+
+@router.get("/jobs/{job_id}/raw")
+async def get_raw_job_payload(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Original source payload of a job (not included in list responses).
+    """
+    payload = await load_raw_payload(job_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="No raw payload stored for this job.")
+    return payload
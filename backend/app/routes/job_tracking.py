@@ -1,13 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from app.core.cache import hot_cache
 from app.database import database
 from app.models.user import User
 from app.core.security import get_current_user
 from app.models.job_tracking import JobTrackingCreate
+from app.utils.pagination import cursor_for, decode_cursor, page_meta, seek_filter
+from app.utils.streaming import EXPORT_FORMATS, export_response, parse_fields
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 router = APIRouter()
 
+# Newest first; _id breaks ties so keyset pages never skip or repeat
+LIST_SORT = [("updated_at", -1), ("_id", -1)]
+EXPORT_FIELDS = ["job_id", "status", "job_data", "created_at", "updated_at"]
+COUNTS_CACHE_NAMESPACE = "tracking_counts"
+hot_cache.namespace(COUNTS_CACHE_NAMESPACE, ttl=300)
+
+def _count_key(user_id: str, status: Optional[str]) -> str:
+    return f"{user_id}|{status or ''}"
+
 async def upsert_job_status(user_id: str, job_id: str, status: str, job_data: dict):
     collection = database.get_collection("job_tracking")
     
@@ -28,6 +40,8 @@ async def upsert_job_status(user_id: str, job_id: str, status: str, job_data: di
             "updated_at": datetime.utcnow()
         }
         await collection.insert_one(new_entry)
+    # Totals per status of this user changed
+    hot_cache.invalidate(COUNTS_CACHE_NAMESPACE, f"{user_id}|")
 
 @router.post("/save")
 async def save_job(
@@ -56,21 +70,44 @@ async def mark_not_interested(
 @router.get("/list")
 async def list_tracked_jobs(
     status: str = "saved",
-    page: int = 1,
-    limit: int = 10,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     current_user: User = Depends(get_current_user)
 ):
+    """
+    Tracked jobs, newest first. Pass next_cursor from the previous response
+    as cursor to seek to the next page (page is then ignored); page numbers
+    still work but skip over earlier entries. Totals are cached per user
+    and status and can be turned off with include_total=false.
+    """
     collection = database.get_collection("job_tracking")
-    skip = (page - 1) * limit
     
     query = {"user_id": current_user["id"]}
     if status:
         query["status"] = status
-        
-    total_count = await collection.count_documents(query)
-    cursor = collection.find(query).sort("updated_at", -1).skip(skip).limit(limit)
-    
-    jobs = await cursor.to_list(length=limit)
+
+    find_filter = query
+    skip = (page - 1) * limit
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+            find_filter = {"$and": [query, seek_filter(LIST_SORT, after)]}
+        except (ValueError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        skip = 0
+
+    total_count = None
+    if include_total:
+        total_count = await hot_cache.get_or_load(
+            COUNTS_CACHE_NAMESPACE,
+            _count_key(current_user["id"], status),
+            lambda: collection.count_documents(query)
+        )
+
+    cursor_docs = collection.find(find_filter).sort(LIST_SORT).skip(skip).limit(limit)
+    jobs = await cursor_docs.to_list(length=limit)
     
     data = [] 
     for job in jobs:
@@ -79,15 +116,35 @@ async def list_tracked_jobs(
         job_info["status"] = job["status"]
         job_info["updated_at"] = job["updated_at"]
         data.append(job_info)
-            
+
+    next_cursor = cursor_for(jobs[-1], LIST_SORT) if len(jobs) == limit else None
     return {
         "data": data,
-        "total": total_count,
-        "page": page,
-        "limit": limit,
-        "total_pages": (total_count + limit - 1) // limit
+        **page_meta(next_cursor, total_count, None if cursor else page, limit)
     }
 
+@router.get("/export")
+async def export_tracked_jobs(
+    status: Optional[str] = None,
+    format: str = Query("ndjson", pattern=EXPORT_FORMATS),
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream all of the user's tracked jobs (optionally one status), newest
+    first, as NDJSON or a JSON array.
+    """
+    try:
+        projection = parse_fields(fields, EXPORT_FIELDS) or {field: 1 for field in EXPORT_FIELDS}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    query = {"user_id": current_user["id"]}
+    if status:
+        query["status"] = status
+    cursor = database.get_collection("job_tracking").find(query, projection).sort(LIST_SORT)
+    return export_response(cursor, format, filename="tracked_jobs")
+
 @router.get("/status/{job_id}")
 async def get_job_status(job_id: str, current_user: User = Depends(get_current_user)):
     collection = database.get_collection("job_tracking")
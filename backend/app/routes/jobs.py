@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Body, HTTPException, Query
 from fastapi.encoders import jsonable_encoder
-from app.database import job_collection, job_helper, database
+from app.database import job_collection, job_helper
 from app.models.job import (
     JobSchema,
     UpdateJobModel,
@@ -9,12 +9,23 @@ from app.models.job import (
     CachedJob
 )
 from app.services.job_fetcher import fetch_jobs_from_api
+from app.services.job_sources.api_jobs import build_query_key, get_cached_docs, read_cached_page
+from app.utils.pagination import decode_cursor, encode_cursor, page_meta
+from app.utils.streaming import EXPORT_FORMATS, export_response, parse_fields
 from bson.objectid import ObjectId
-from datetime import datetime, timedelta
-import hashlib
+from typing import List, Optional
 
 router = APIRouter()
 
+JOB_FIELDS = ["title", "description", "company", "location"]
+
+def _next_cursor(docs: List[dict], query_key: str, limit: int) -> Optional[str]:
+    # Seeks within one cached result set (fetched_at), in _id order
+    if len(docs) < limit or "fetched_at" not in docs[-1]:
+        return None
+    last = docs[-1]
+    return encode_cursor({"q": query_key, "fetched_at": last["fetched_at"], "_id": ObjectId(str(last["_id"]))})
+
 @router.get("/test-api", response_description="Test RapidAPI Connection")
 async def test_api():
     try:
@@ -30,54 +41,66 @@ async def test_api():
         }
 
 
-def generate_query_key(query: str, location: str, remote: bool) -> str:
-    raw = f"{query.lower()}-{location.lower() if location else ''}-{str(remote).lower()}"
-    return hashlib.md5(raw.encode()).hexdigest()
-
 @router.get("/search", response_description="Search jobs from API or Cache")
 async def search_jobs(
     query: str = Query(..., min_length=1),
     location: str = Query(None),
     remote: bool = Query(False),
     page: int = Query(1, ge=1),
-    limit: int = Query(10, ge=1, le=100)
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = True
 ):
-    query_key = generate_query_key(query, location, remote)
+    """
+    With cursor (meta.next_cursor of the previous response) the next page
+    is read by seeking on _id instead of by page number.
+    """
+    query_key = build_query_key(query, location, remote)
     skip = (page - 1) * limit
+
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+            if after["q"] != query_key:
+                raise ValueError("cursor belongs to another query")
+        except (ValueError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        cached_jobs = await read_cached_page(query_key, after["fetched_at"], after["_id"], limit)
+        total_count = None
+        if include_total:
+            docs = await get_cached_docs(query_key)
+            total_count = len(docs) if docs is not None else None
+        next_cursor = _next_cursor(cached_jobs, query_key, limit)
+        for job in cached_jobs:
+            job["_id"] = str(job["_id"])
+
+        return {
+            "data": cached_jobs,
+            "code": 200,
+            "message": "Jobs retrieved from cache",
+            "meta": page_meta(next_cursor, total_count, limit=limit)
+        }
     
-    # 1. Check Cache
-    cached_jobs_cursor = database.get_collection("cached_jobs").find({"query_key": query_key})
-    total_count = await database.get_collection("cached_jobs").count_documents({"query_key": query_key})
-    cached_jobs = await cached_jobs_cursor.skip(skip).limit(limit).to_list(length=limit)
-    
-    if cached_jobs:
-        # Check if cache is fresh (e.g., < 24 hours)
-        # Assuming all jobs in a batch have similar fetched_at, check the first one
-        first_job = cached_jobs[0]
-        if "fetched_at" in first_job:
-            fetched_at = first_job["fetched_at"]
-            if datetime.utcnow() - fetched_at < timedelta(hours=24):
-                # Return cached
-                # Convert ObjectId to str for response
-                for job in cached_jobs:
-                    job["_id"] = str(job["_id"])
-                
-                return {
-                    "data": cached_jobs,
-                    "code": 200,
-                    "message": "Jobs retrieved from cache",
-                    "meta": {
-                        "page": page,
-                        "limit": limit,
-                        "total": total_count,
-                        "total_pages": (total_count + limit - 1) // limit
-                    }
-                }
-            else:
-                # Cache expired, delete old entries
-                await database.get_collection("cached_jobs").delete_many({"query_key": query_key})
+    # 1. Check Cache (shared with /hybrid-jobs, see api_jobs)
+    docs = await get_cached_docs(query_key)
+    if docs is not None:
+        total_count = len(docs)
+        cached_jobs = docs[skip:skip + limit]
+        next_cursor = _next_cursor(cached_jobs, query_key, limit)
+
+        # Convert ObjectId to str for response
+        for job in cached_jobs:
+            job["_id"] = str(job["_id"])
+
+        return {
+            "data": cached_jobs,
+            "code": 200,
+            "message": "Jobs retrieved from cache",
+            "meta": page_meta(next_cursor, total_count if include_total else None, page, limit)
+        }
     
-    # 2. Fetch from API
+    # 2. Fetch from API (the shared cache is refreshed as part of the fetch)
     fetched_data = await fetch_jobs_from_api(query, location, remote)
     
     if not fetched_data:
@@ -85,35 +108,9 @@ async def search_jobs(
             "data": [],
             "code": 200,
             "message": "No jobs found",
-            "meta": {
-                "page": page,
-                "limit": limit,
-                "total": 0,
-                "total_pages": 0
-            }
+            "meta": page_meta(None, 0 if include_total else None, page, limit)
         }
-        
-    # 3. Save to Cache
-    jobs_to_cache = []
-    for job in fetched_data:
-        job["query_key"] = query_key
-        job["fetched_at"] = datetime.utcnow()
-        jobs_to_cache.append(job)
-        
-    if jobs_to_cache:
-        await database.get_collection("cached_jobs").insert_many(jobs_to_cache)
-    
-    for job in fetched_data:
-        if "_id" in job:
-            job["_id"] = str(job["_id"])
 
-    # Pagination for API results (in-memory since API returns all or limited batch)
-    # Assuming fetch_jobs_from_api returns a list, we slice it here if it's large, 
-    # but typically external APIs paginate. Here we just return what we got, 
-    # but to be consistent with the interface, we'll pretend it's one page or slice it.
-    # Since we just cached them, we can query the cache again or just return the slice.
-    # For simplicity, let's return the slice of what we just fetched.
-    
     total_fetched = len(fetched_data)
     start = (page - 1) * limit
     end = start + limit
@@ -123,12 +120,7 @@ async def search_jobs(
         "data": paginated_data,
         "code": 200,
         "message": "Jobs fetched from API",
-        "meta": {
-            "page": page,
-            "limit": limit,
-            "total": total_fetched,
-            "total_pages": (total_fetched + limit - 1) // limit
-        }
+        "meta": page_meta(_next_cursor(paginated_data, query_key, limit), total_fetched if include_total else None, page, limit)
     }
 
 # --- Existing CRUD Operations ---
@@ -140,11 +132,32 @@ async def add_job_data(job: JobSchema = Body(...)):
     created_job = await job_collection.find_one({"_id": new_job.inserted_id})
     return ResponseModel(job_helper(created_job), "Job added successfully.")
 
+def _export_job(job: dict) -> dict:
+    # job_helper's shape, limited to the projected fields
+    return {"id": str(job["_id"]), **{field: job[field] for field in JOB_FIELDS if field in job}}
+
 @router.get("s", response_description="Jobs retrieved")
-async def get_jobs():
+async def get_jobs(
+    stream: bool = False,
+    format: str = Query("ndjson", pattern=EXPORT_FORMATS),
+    fields: Optional[str] = None
+):
+    """
+    With stream=true the collection is streamed as NDJSON (or a chunked
+    JSON array with format=json) instead of being loaded into memory;
+    fields limits each job to a comma separated subset of JOB_FIELDS.
+    """
+    try:
+        projection = parse_fields(fields, JOB_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if stream:
+        return export_response(job_collection.find({}, projection), format, _export_job, filename="jobs")
+
     jobs = []
-    async for job in job_collection.find():
-        jobs.append(job_helper(job))
+    async for job in job_collection.find({}, projection):
+        jobs.append(_export_job(job) if projection else job_helper(job))
     return ResponseModel(jobs, "Jobs data retrieved successfully")
 
 @router.get("/{id}", response_description="Job data retrieved")
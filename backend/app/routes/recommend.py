@@ -6,6 +6,7 @@ from app.core.security import get_current_user
 from app.services.matching_engine import calculate_match_score, rank_jobs
 from app.models.resume import Resume
 from app.models.job import ResponseModel
+from app.services.job_sources.api_jobs import CACHE_COLLECTION, PUBLISHED
 
 router = APIRouter()
 
@@ -28,7 +29,7 @@ async def get_recommendations(
         resume = Resume(**resume_data)
         
         # 2. Fetch Jobs to Match Against
-        cached_jobs_cursor = database.get_collection("cached_jobs").find()
+        cached_jobs_cursor = database.get_collection(CACHE_COLLECTION).find(PUBLISHED, {"raw_data": 0})
         cached_jobs = await cached_jobs_cursor.to_list(length=100)
         
         if not cached_jobs:
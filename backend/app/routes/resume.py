@@ -1,9 +1,11 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, status
-from app.services.resume_parser import extract_text_from_pdf, extract_text_from_docx, parse_resume_text
+from app.services.resume_parser import extract_text_from_pdf, extract_text_from_docx, parse_resume_text, PARSER_VERSION
+from app.services.resume_reparser import derive_fields, user_overrides
 from app.models.resume import ResumeParsedData, ResumeCreate, Resume, ResumeSaveRequest
 from app.models.user import User
 from app.core.security import get_current_user
 from app.database import database
+import asyncio
 import shutil
 import os
 import uuid
@@ -66,6 +68,14 @@ async def parse_resume(
             raise HTTPException(status_code=400, detail="Unsupported file format")
             
         parsed_data = parse_resume_text(text)
+
+        # Keep the extracted text so /save can store it with the resume and
+        # later parser versions can re-parse it without touching the file.
+        await database.get_collection("resume_texts").update_one(
+            {"file_path": file_path, "user_id": current_user["id"]},
+            {"$set": {"text": text, "created_at": datetime.utcnow()}},
+            upsert=True
+        )
         return parsed_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Parsing failed: {str(e)}")
@@ -83,21 +93,46 @@ async def save_resume(
     resume_dict["user_id"] = current_user["id"]
     # file_path is already in resume_dict
     resume_dict["created_at"] = datetime.utcnow()
-    
+
     # Check if resume exists for this user
     existing_resume = await database.get_collection("resumes").find_one({"user_id": current_user["id"]})
-    
+
+    # Raw text of the saved file: extracted during /parse, or already on the
+    # resume when the same file is saved again
+    text_entry = await database.get_collection("resume_texts").find_one(
+        {"file_path": resume_data.file_path, "user_id": current_user["id"]}
+    )
+    raw_text = None
+    if text_entry:
+        raw_text = text_entry["text"]
+    elif existing_resume and existing_resume.get("file_path") == resume_data.file_path:
+        raw_text = existing_resume.get("raw_text")
+
+    unset = {}
+    if raw_text is not None:
+        resume_dict["raw_text"] = raw_text
+        resume_dict["parser_version"] = PARSER_VERSION
+        # Edited fields are kept as saved by later re-parses
+        derived = await asyncio.to_thread(derive_fields, raw_text)
+        resume_dict["user_overrides"] = user_overrides(resume_dict, derived)
+    else:
+        # No text for this file: never re-parse the previous file's text
+        unset = {"raw_text": "", "parser_version": "", "user_overrides": ""}
+
     if existing_resume:
         # Update existing resume
-        await database.get_collection("resumes").update_one(
-            {"_id": existing_resume["_id"]},
-            {"$set": resume_dict}
-        )
+        update = {"$set": resume_dict}
+        if unset:
+            update["$unset"] = unset
+        await database.get_collection("resumes").update_one({"_id": existing_resume["_id"]}, update)
         resume_id = existing_resume["_id"]
     else:
         # Insert new resume
         new_resume = await database.get_collection("resumes").insert_one(resume_dict)
         resume_id = new_resume.inserted_id
+
+    # The text now lives on the resume; texts of earlier uploads are replaced with it
+    await database.get_collection("resume_texts").delete_many({"user_id": current_user["id"]})
     
     created_resume = await database.get_collection("resumes").find_one({"_id": resume_id})
     
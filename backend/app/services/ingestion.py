@@ -0,0 +1,161 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+from app.core import metrics
+from app.core.http_client import start_http_client, close_http_client
+from app.database import database
+from app.services.job_sources import scrape_remoteok, scrape_hn_jobs
+from app.services.job_sources.feed_cache import get_feed_snapshot, FEED_TTL_MINUTES
+from app.services.job_sources.merge_jobs import (
+    CACHE_COLLECTION,
+    CACHE_DURATION_HOURS,
+    LEASE_COLLECTION,
+    QUERY_STATS_COLLECTION,
+    build_cache_key,
+    refresh_hybrid_jobs,
+)
+from app.utils.single_flight import acquire_lease
+
+# Each run is delayed by up to this fraction of its interval
+JITTER = 0.1
+# A refresh-ahead job must land at least this long before what it keeps
+# warm expires, so requests never find it stale
+REFRESH_MARGIN_SECONDS = 2 * 60
+
+def refresh_interval(ttl: float) -> float:
+    """
+    Longest interval whose jittered sleep still refreshes within ttl.
+    """
+    return (ttl - REFRESH_MARGIN_SECONDS) / (1 + JITTER)
+
+FEED_TTL_SECONDS = FEED_TTL_MINUTES * 60
+# Query-independent feeds refreshed on their own schedule (seconds)
+FEED_INTERVALS = {
+    "remoteok": 20 * 60,
+    "hn": refresh_interval(FEED_TTL_SECONDS),
+}
+POPULAR_QUERIES_INTERVAL = 30 * 60
+POPULAR_QUERIES_LIMIT = 20
+POPULAR_QUERIES_WINDOW_DAYS = 7
+# Refresh a popular query once its cache entry is this old, so requests
+# keep hitting fresh entries
+REFRESH_AHEAD_HOURS = CACHE_DURATION_HOURS - 1
+
+FEEDS = {
+    "remoteok": (scrape_remoteok.FEED_URL, scrape_remoteok.new_remoteok_parser, scrape_remoteok.HEADERS),
+    "hn": (scrape_hn_jobs.PAGE_URL, scrape_hn_jobs.new_hn_parser, scrape_hn_jobs.HEADERS),
+}
+
+async def refresh_feed(source: str) -> None:
+    url, new_parser, headers = FEEDS[source]
+    # ttl=0 forces a (conditional) refresh; unchanged feeds are not re-parsed
+    snapshot = await get_feed_snapshot(source, url, new_parser, headers=headers, ttl=timedelta(0))
+    print(f"Ingestion: {source} feed has {len(snapshot.jobs)} jobs")
+
+async def get_popular_queries(limit: int = POPULAR_QUERIES_LIMIT) -> List[dict]:
+    since = datetime.utcnow() - timedelta(days=POPULAR_QUERIES_WINDOW_DAYS)
+    cursor = database.get_collection(QUERY_STATS_COLLECTION).find(
+        {"last_requested_at": {"$gte": since}}
+    ).sort("count", -1).limit(limit)
+    return await cursor.to_list(length=limit)
+
+async def refresh_popular_queries() -> None:
+    cache = database.get_collection(CACHE_COLLECTION)
+    refresh_before = datetime.utcnow() - timedelta(hours=REFRESH_AHEAD_HOURS)
+
+    for entry in await get_popular_queries():
+        # Recomputed: stats recorded under an older key format still count
+        key = build_cache_key(entry["query"], entry.get("location", ""), entry.get("remote", False))
+        cached = await cache.find_one({"query_key": key}, {"fetched_at": 1})
+        if cached and cached.get("fetched_at") and cached["fetched_at"] > refresh_before:
+            continue
+        try:
+            # A refinement would copy the broader entry's older fetched_at
+            await refresh_hybrid_jobs(entry["query"], entry.get("location", ""), entry.get("remote", False), refine=False)
+            metrics.increment("ingestion.queries_refreshed")
+        except Exception as e:
+            print(f"Ingestion: refresh failed for {entry['query_key']}: {e}")
+
+class IngestionScheduler:
+    """
+    Runs each ingestion job in its own loop with a per-job interval and
+    random jitter, so the request path only reads what was ingested.
+
+    Every API worker (and the standalone worker) may run a scheduler: each
+    run first takes a lease on the job for one interval, so a job runs once
+    per interval across all of them.
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, tuple] = {}
+        self.tasks: List[asyncio.Task] = []
+
+    def add_job(self, name: str, func: Callable[[], Awaitable[None]], interval: float, ttl: Optional[float] = None):
+        """
+        ttl: how long what the job refreshes stays fresh; the jittered
+        interval plus REFRESH_MARGIN_SECONDS must fit in it.
+        """
+        self.jobs[name] = (func, interval, ttl)
+
+    async def _run(self, name: str, func: Callable[[], Awaitable[None]], interval: float):
+        # Spread the first runs so everything does not fire at startup at once
+        await asyncio.sleep(random.uniform(0, interval * JITTER))
+        while True:
+            started = datetime.utcnow()
+            try:
+                # Not released: the lease expiring is what allows the next run
+                if await acquire_lease(database.get_collection(LEASE_COLLECTION), f"ingestion:{name}", interval):
+                    await func()
+                    metrics.increment(f"ingestion.runs.{name}")
+                    metrics.set_gauge(f"ingestion.last_run_seconds.{name}", (datetime.utcnow() - started).total_seconds())
+                else:
+                    metrics.increment(f"ingestion.skipped.{name}")
+            except Exception as e:
+                metrics.increment(f"ingestion.failures.{name}")
+                print(f"Ingestion job {name} failed: {e}")
+            await asyncio.sleep(interval + random.uniform(0, interval * JITTER))
+
+    def start(self):
+        for name, (func, interval, ttl) in self.jobs.items():
+            if ttl is not None and interval * (1 + JITTER) + REFRESH_MARGIN_SECONDS > ttl:
+                raise ValueError(f"Ingestion job {name}: interval {interval:.0f}s does not refresh ahead of its {ttl:.0f}s ttl")
+        for name, (func, interval, _) in self.jobs.items():
+            self.tasks.append(asyncio.create_task(self._run(name, func, interval)))
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+def create_scheduler() -> IngestionScheduler:
+    scheduler = IngestionScheduler()
+    for source, interval in FEED_INTERVALS.items():
+        scheduler.add_job(f"feed.{source}", lambda source=source: refresh_feed(source), interval, ttl=FEED_TTL_SECONDS)
+    # Entries are refreshed once REFRESH_AHEAD_HOURS old: the checks must
+    # come often enough to catch them before CACHE_DURATION_HOURS
+    scheduler.add_job(
+        "popular_queries",
+        refresh_popular_queries,
+        POPULAR_QUERIES_INTERVAL,
+        ttl=(CACHE_DURATION_HOURS - REFRESH_AHEAD_HOURS) * 3600
+    )
+    return scheduler
+
+async def run_worker() -> None:
+    """
+    Standalone worker: python -m app.services.ingestion
+    Use with INGESTION_IN_PROCESS=false so the API processes only serve.
+    """
+    await start_http_client()
+    scheduler = create_scheduler()
+    scheduler.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await scheduler.stop()
+        await close_http_client()
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
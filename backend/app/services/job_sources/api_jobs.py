@@ -1,63 +1,306 @@
-import httpx
-from typing import List, Optional
+import asyncio
+import hashlib
+from app.core import http_client
+from app.core.cache import hot_cache
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
 from app.core.config import settings
-from app.services.job_sources.normalize import normalize_job_data
+from app.database import database
+from app.services.job_sources.normalize import normalize_job_data, job_fingerprint
+from app.services.job_sources.job_store import save_raw_payloads
+from app.services.job_sources.registry import register_source, stream_progress
 from app.models.hybrid_job import HybridJob
-from datetime import datetime
+from app.utils.query_normalizer import canonical_key
+from app.utils.single_flight import SingleFlight
+from datetime import datetime, timedelta
 
 BASE_URL = "https://jsearch.p.rapidapi.com/search"
 
-async def fetch_jsearch_jobs(query: str, location: Optional[str] = None, remote: bool = False) -> List[HybridJob]:
-    if not settings.RAPIDAPI_KEY:
-        print("WARNING: RapidAPI key not configured")
-        return []
+# One document per job per query, shared by /job/search, /hybrid-jobs,
+# recommendations and the dashboard
+CACHE_COLLECTION = "cached_jobs"
+CACHE_DURATION_HOURS = 24
+
+# Entries written before payloads moved to job_store still embed raw_data
+WITHOUT_RAW = {"raw_data": 0}
+# Documents of a refresh still being written are marked pending; every
+# reader of CACHE_COLLECTION adds this to its filter
+PUBLISHED = {"pending": {"$ne": True}}
+
+_jsearch_flight = SingleFlight("jsearch")
+# Fresh query results kept in process memory; a miss means a billed
+# refresh, so it is never cached
+HOT_CACHE_NAMESPACE = "jsearch"
+hot_cache.namespace(HOT_CACHE_NAMESPACE, ttl=120)
 
+# JSearch returns at most this many jobs per page; a shorter page is the last one
+PAGE_SIZE = 10
+
+async def iter_jsearch_pages(
+    query: str,
+    location: Optional[str] = None,
+    remote: bool = False,
+    max_pages: Optional[int] = None
+) -> AsyncIterator[Tuple[int, List[dict]]]:
+    """
+    Yield (page, raw items) for up to max_pages JSearch pages, in the order
+    they arrive. Page 1 is requested on its own; only when it is full are
+    the rest requested concurrently (JSEARCH_PAGE_CONCURRENCY at a time).
+    Pages after a short, failed or quota-refused page are not requested, so
+    each page costs one unit of RapidAPI quota only when it can still hold
+    results.
+    """
     headers = {
         "x-rapidapi-key": settings.RAPIDAPI_KEY,
         "x-rapidapi-host": settings.RAPIDAPI_HOST
     }
-    
+
     search_query = query
     if location:
         search_query += f" in {location}"
-    
+
     params = {
         "query": search_query,
-        "page": "1",
         "num_pages": "1"
     }
-    
+
     if remote:
         params["remote_jobs_only"] = "true"
 
-    async with httpx.AsyncClient() as client:
-        try:
-            print(f"Fetching JSearch jobs: {search_query}")
-            response = await client.get(BASE_URL, headers=headers, params=params, timeout=10.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            jobs = []
-            if "data" in data:
-                for item in data["data"]:
-                    # Parse date if possible, else None
-                    published_at = None
-                    # JSearch returns ISO format usually
-                    
-                    job = normalize_job_data(
-                        job_id=item.get("job_id"),
-                        title=item.get("job_title"),
-                        company=item.get("employer_name"),
-                        location=f"{item.get('job_city', '')}, {item.get('job_country', '')}".strip(", "),
-                        description=item.get("job_description"),
-                        apply_link=item.get("job_apply_link"),
-                        source="api",
-                        job_type=item.get("job_employment_type"),
-                        published_at=published_at, # TODO: Parse date
-                        raw_data=item
-                    )
-                    jobs.append(job)
-            return jobs
-        except Exception as e:
-            print(f"Error fetching JSearch jobs: {e}")
+    max_pages = max_pages or settings.JSEARCH_MAX_PAGES
+    semaphore = asyncio.Semaphore(settings.JSEARCH_PAGE_CONCURRENCY)
+    # Lowered as soon as a page shows there is nothing beyond it
+    last_page = max_pages
+
+    async def fetch_page(page: int) -> Tuple[int, List[dict]]:
+        nonlocal last_page
+        async with semaphore:
+            if page > last_page:
+                return page, []
+            try:
+                response = await http_client.get("jsearch", BASE_URL, headers=headers, params={**params, "page": str(page)})
+                response.raise_for_status()
+                items = response.json().get("data") or []
+            except Exception as e:
+                # Includes resilience.SourceUnavailable (breaker open, quota used up)
+                print(f"JSearch page {page} for '{search_query}' failed: {e}")
+                last_page = min(last_page, page - 1)
+                return page, []
+            if len(items) < PAGE_SIZE:
+                last_page = min(last_page, page)
+            return page, items
+
+    print(f"Fetching JSearch jobs: {search_query} (up to {max_pages} pages)")
+    # Most queries fit on one page: do not pay for the others up front
+    page, items = await fetch_page(1)
+    if items:
+        yield page, items
+
+    tasks = [asyncio.create_task(fetch_page(page)) for page in range(2, last_page + 1)]
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            page, items = await next_page
+            if items:
+                yield page, items
+    finally:
+        # Consumer stopped early or was cancelled
+        for task in tasks:
+            task.cancel()
+
+def build_query_key(query: str, location: Optional[str], remote: bool) -> str:
+    """
+    Cache key of a JSearch query, shared by every spelling of the same
+    search (see app.utils.query_normalizer).
+    """
+    return hashlib.md5(canonical_key(query, location or "", remote).encode()).hexdigest()
+
+def to_cached_job(item: dict, query_key: str, fetched_at: datetime) -> dict:
+    return {
+        "job_id": item.get("job_id"),
+        "title": item.get("job_title"),
+        "company": item.get("employer_name"),
+        "location": f"{item.get('job_city', '')}, {item.get('job_country', '')}".strip(", "),
+        "job_type": item.get("job_employment_type"),
+        "apply_link": item.get("job_apply_link"),
+        "description": item.get("job_description"),
+        "source": "RapidAPI",
+        "posted_date": item.get("job_posted_at_datetime_utc"),
+        "query_key": query_key,
+        "fetched_at": fetched_at
+    }
+
+def to_hybrid_job(doc: dict) -> HybridJob:
+    return normalize_job_data(
+        job_id=doc.get("job_id"),
+        title=doc.get("title"),
+        company=doc.get("company"),
+        location=doc.get("location"),
+        description=doc.get("description"),
+        apply_link=doc.get("apply_link"),
+        source="api",
+        job_type=doc.get("job_type"),
+        published_at=None, # TODO: Parse date
+        raw_data=doc.get("raw_data", {})
+    )
+
+async def get_fresh_fetched_at(query_key: str) -> Optional[datetime]:
+    """
+    fetched_at of the cached result for query_key, or None if it is missing or expired.
+    """
+    doc = await database.get_collection(CACHE_COLLECTION).find_one(
+        {"query_key": query_key, **PUBLISHED},
+        {"fetched_at": 1},
+        sort=[("fetched_at", -1)]
+    )
+    if doc and datetime.utcnow() - doc["fetched_at"] < timedelta(hours=CACHE_DURATION_HOURS):
+        return doc["fetched_at"]
+    return None
+
+async def _read_cached(query_key: str, projection: Optional[dict], fetched_at: Optional[datetime] = None) -> List[dict]:
+    """
+    Documents of one refresh of the query (the latest complete one by
+    default) in API order.
+    """
+    if fetched_at is None:
+        latest = await database.get_collection(CACHE_COLLECTION).find_one(
+            {"query_key": query_key, **PUBLISHED},
+            {"fetched_at": 1},
+            sort=[("fetched_at", -1)]
+        )
+        if not latest:
             return []
+        fetched_at = latest["fetched_at"]
+    cursor = database.get_collection(CACHE_COLLECTION).find(
+        {"query_key": query_key, "fetched_at": fetched_at},
+        projection
+    ).sort("_id", 1)
+    return await cursor.to_list(length=None)
+
+async def _read_fresh(query_key: str) -> Optional[List[dict]]:
+    fetched_at = await get_fresh_fetched_at(query_key)
+    if not fetched_at:
+        return None
+    return await _read_cached(query_key, WITHOUT_RAW, fetched_at)
+
+async def get_cached_docs(query_key: str) -> Optional[List[dict]]:
+    """
+    Fresh cached documents of a query in API order (copies), or None when
+    it has to be fetched. Served from the in-process tier when possible.
+    """
+    docs = await hot_cache.get_or_load(HOT_CACHE_NAMESPACE, query_key, lambda: _read_fresh(query_key))
+    if docs is None:
+        return None
+    return [dict(doc) for doc in docs]
+
+async def read_cached_page(query_key: str, fetched_at: datetime, after_id: Any, limit: int) -> List[dict]:
+    """
+    Keyset page of one cached result set: documents of the refresh at
+    fetched_at with _id after after_id, in API order. Empty once that
+    result set has been replaced.
+    """
+    cursor = database.get_collection(CACHE_COLLECTION).find(
+        {"query_key": query_key, "fetched_at": fetched_at, "_id": {"$gt": after_id}},
+        WITHOUT_RAW
+    ).sort("_id", 1).limit(limit)
+    return await cursor.to_list(length=limit)
+
+async def refresh_jsearch_cache(
+    query: str,
+    location: Optional[str] = None,
+    remote: bool = False,
+    on_docs: Optional[Callable[[List[dict]], None]] = None
+) -> List[dict]:
+    """
+    Fetch the query from JSearch and replace its cached documents.
+    Concurrent refreshes of the same query share one set of API calls.
+    Returns the documents in API order. on_docs is called with each page's
+    documents as it arrives, when this call runs the fetch.
+    """
+    query_key = build_query_key(query, location, remote)
+
+    async def fetch() -> List[dict]:
+        fetched_at = datetime.utcnow()
+        collection = database.get_collection(CACHE_COLLECTION)
+        pages = {}
+        written = []
+        next_page = 1
+
+        async def write(docs: List[dict], items: List[dict]) -> None:
+            # The full JSearch item is kept out of the cache documents
+            payloads = {}
+            for doc, item in zip(docs, items):
+                job = to_hybrid_job(doc)
+                payloads[job_fingerprint(job)] = (job, item)
+            await save_raw_payloads(payloads)
+            # Hidden from readers (pending) until every page is in
+            pending = [{**doc, "pending": True} for doc in docs]
+            await collection.insert_many(pending)
+            for doc, stored in zip(docs, pending):
+                doc["_id"] = stored["_id"]
+            written.extend(docs)
+
+        # Normalize and write each page as it arrives. Inserts follow page
+        # order so _id order stays API order; an early later page waits
+        async for page, items in iter_jsearch_pages(query, location, remote):
+            pages[page] = ([to_cached_job(item, query_key, fetched_at) for item in items], items)
+            if on_docs:
+                on_docs(pages[page][0])
+            while next_page in pages:
+                await write(*pages.pop(next_page))
+                next_page += 1
+        # Pages after a failed one
+        for page in sorted(pages):
+            await write(*pages[page])
+
+        if not written:
+            # Nothing new (or the API is unavailable): keep serving what we had
+            return await _read_cached(query_key, None)
+
+        # Publish, then drop the previous result so readers never see an empty one
+        await collection.update_many({"query_key": query_key, "fetched_at": fetched_at}, {"$unset": {"pending": ""}})
+        await collection.delete_many({"query_key": query_key, "fetched_at": {"$lt": fetched_at}})
+        hot_cache.invalidate(HOT_CACHE_NAMESPACE, query_key)
+        return written
+
+    docs = await _jsearch_flight.do(query_key, fetch)
+    # Coalesced callers get their own copies
+    return [dict(doc) for doc in docs]
+
+async def get_jsearch_docs(query: str, location: Optional[str] = None, remote: bool = False) -> List[dict]:
+    """
+    Read-through access to the shared JSearch cache.
+    """
+    if not settings.RAPIDAPI_KEY:
+        print("WARNING: RapidAPI key not configured")
+        return []
+
+    docs = await get_cached_docs(build_query_key(query, location, remote))
+    if docs is not None:
+        return docs
+    return await refresh_jsearch_cache(query, location, remote)
+
+async def fetch_jsearch_jobs(query: str, location: Optional[str] = None, remote: bool = False) -> List[HybridJob]:
+    try:
+        docs = await get_jsearch_docs(query, location, remote)
+        return [to_hybrid_job(doc) for doc in docs]
+    except Exception as e:
+        print(f"Error fetching JSearch jobs: {e}")
+        return []
+
+@register_source("api", priority=0, ttl=timedelta(hours=CACHE_DURATION_HOURS))
+async def stream_jsearch_jobs(query: str, location: str, remote: bool) -> AsyncIterator[HybridJob]:
+    if not settings.RAPIDAPI_KEY:
+        print("WARNING: RapidAPI key not configured")
+        return
+
+    docs = await get_cached_docs(build_query_key(query, location, remote))
+    if docs is not None:
+        for doc in docs:
+            yield to_hybrid_job(doc)
+        return
+
+    async def run(on_docs):
+        return await refresh_jsearch_cache(query, location, remote, on_docs=on_docs)
+
+    # Jobs of each page are yielded as the page arrives
+    async for doc in stream_progress(run, key=lambda doc: doc.get("job_id")):
+        yield to_hybrid_job(doc)
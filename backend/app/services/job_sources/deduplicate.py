@@ -1,38 +1,195 @@
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from pymongo.errors import BulkWriteError
+from app.database import database
 from app.models.hybrid_job import HybridJob
-from fuzzywuzzy import fuzz
+from app.utils.minhash import JobSketch, LSHIndex, band_keys, normalize_tokens
+
+# Priority: api > wwr > remoteok > hn
+SOURCE_PRIORITY = {"api": 0, "wwr": 1, "remoteok": 2, "hn": 3}
+
+# Sketch of every job ever merged, so reposts are recognised over time
+SIGNATURE_COLLECTION = "job_signatures"
+
+def sketch_job(job: HybridJob) -> JobSketch:
+    return JobSketch.from_job(job.title, job.company, job.description)
+
+class Deduplicator:
+    """
+    Incremental version of deduplicate_jobs for jobs that arrive one by one.
+
+    Duplicates are matched on apply_link, on normalized (title, company),
+    on near-duplicate content (MinHash/LSH, see app.utils.minhash) and,
+    when clusters are given, on corpus cluster id. When a higher priority
+    copy of a job arrives after a lower priority one, it takes the earlier
+    job's place, so the final result does not depend on arrival order.
+    """
+
+    def __init__(self, source_priority: Optional[Dict[str, int]] = None, clusters: Optional[Dict[str, str]] = None):
+        self.source_priority = source_priority or SOURCE_PRIORITY
+        self.clusters = clusters or {}
+        # Sketches by job_id, reusable by assign_clusters
+        self.sketches: Dict[str, JobSketch] = {}
+        self._jobs: Dict[int, HybridJob] = {}
+        self._by_link: Dict[str, int] = {}
+        self._by_title_company: Dict[tuple, int] = {}
+        self._by_cluster: Dict[str, int] = {}
+        self._lsh = LSHIndex()
+        self._next_slot = 0
+
+    def _priority(self, job: HybridJob) -> int:
+        return self.source_priority.get(job.source, 99)
+
+    @staticmethod
+    def _title_company(job: HybridJob) -> tuple:
+        # "Sr. Dev" and "Senior Developer" are the same key
+        return (" ".join(normalize_tokens(job.title)), " ".join(normalize_tokens(job.company)))
+
+    def _sketch(self, job: HybridJob) -> JobSketch:
+        if job.job_id not in self.sketches:
+            self.sketches[job.job_id] = sketch_job(job)
+        return self.sketches[job.job_id]
+
+    def _forget(self, slot: int) -> HybridJob:
+        old = self._jobs.pop(slot)
+        if self._by_link.get(old.apply_link) == slot:
+            del self._by_link[old.apply_link]
+        if self._by_title_company.get(self._title_company(old)) == slot:
+            del self._by_title_company[self._title_company(old)]
+        cluster = self.clusters.get(old.job_id)
+        if cluster and self._by_cluster.get(cluster) == slot:
+            del self._by_cluster[cluster]
+        self._lsh.remove(slot)
+        return old
+
+    def add(self, job: HybridJob) -> Tuple[bool, List[HybridJob]]:
+        """
+        Offer a job. Returns (accepted, replaced): accepted is False for a
+        duplicate, replaced lists earlier jobs the new one superseded.
+        """
+        key = self._title_company(job)
+        sketch = self._sketch(job)
+        cluster = self.clusters.get(job.job_id)
+
+        slots = {
+            self._by_link.get(job.apply_link),
+            self._by_title_company.get(key),
+            self._by_cluster.get(cluster) if cluster else None,
+        } - {None}
+        slots.update(self._lsh.near_duplicates(sketch))
+
+        if any(self._priority(self._jobs[slot]) <= self._priority(job) for slot in slots):
+            return False, []
+
+        replaced = [self._forget(slot) for slot in sorted(slots)]
+
+        # Take the place of the first job it replaces
+        slot = min(slots) if slots else self._next_slot
+        self._next_slot += 1
+        self._jobs[slot] = job
+        self._by_link[job.apply_link] = slot
+        self._by_title_company[key] = slot
+        if cluster:
+            self._by_cluster[cluster] = slot
+        self._lsh.add(slot, sketch)
+        return True, replaced
+
+    def jobs(self) -> List[HybridJob]:
+        return [self._jobs[slot] for slot in sorted(self._jobs)]
+
+    def __len__(self) -> int:
+        return len(self._jobs)
 
 def deduplicate_jobs(jobs: List[HybridJob]) -> List[HybridJob]:
     """
-    Remove duplicates based on apply_link and (title + company).
+    Remove duplicates based on apply_link, (title + company) and near-duplicate content.
     Prioritize API source over scrapers if duplicate found.
     """
-    unique_jobs = []
-    seen_links = set()
-    seen_title_company = set()
-    
     # Sort jobs to prioritize API source (so it gets processed first)
-    # Priority: api > wwr > remoteok > hn
-    source_priority = {"api": 0, "wwr": 1, "remoteok": 2, "hn": 3}
-    jobs.sort(key=lambda x: source_priority.get(x.source, 99))
-    
+    jobs.sort(key=lambda x: SOURCE_PRIORITY.get(x.source, 99))
+
+    deduplicator = Deduplicator()
+    for job in jobs:
+        deduplicator.add(job)
+    return deduplicator.jobs()
+
+async def assign_clusters(jobs: List[HybridJob], sketches: Optional[Dict[str, JobSketch]] = None) -> Dict[str, str]:
+    """
+    Map each job_id to a cluster id shared by its near duplicates across
+    the whole persisted corpus (reposts, other sources, earlier fetches).
+
+    Jobs seen before keep their cluster. New jobs are compared only with
+    corpus entries sharing an LSH band (one indexed $in query per call)
+    and join the matching cluster, or start their own.
+    """
+    collection = database.get_collection(SIGNATURE_COLLECTION)
+    sketches = sketches or {}
+    now = datetime.utcnow()
+    job_ids = list({job.job_id for job in jobs})
+
+    clusters = {}
+    async for doc in collection.find({"_id": {"$in": job_ids}}, {"cluster_id": 1}):
+        clusters[doc["_id"]] = doc["cluster_id"]
+    if clusters:
+        await collection.update_many({"_id": {"$in": list(clusters)}}, {"$set": {"seen_at": now}})
+
+    new_jobs = {job.job_id: job for job in jobs if job.job_id not in clusters}
+    if not new_jobs:
+        return clusters
+
+    for job_id, job in new_jobs.items():
+        if job_id not in sketches:
+            sketches[job_id] = sketch_job(job)
+
+    bands = {band for job_id in new_jobs for band in band_keys(sketches[job_id].signature)}
+    index = LSHIndex()
+    cluster_of = {}
+    async for doc in collection.find({"bands": {"$in": list(bands)}}, {"signature": 1, "head": 1, "cluster_id": 1}):
+        index.add(doc["_id"], JobSketch(doc["signature"], doc["head"]))
+        cluster_of[doc["_id"]] = doc["cluster_id"]
+
+    docs = []
+    for job_id, job in new_jobs.items():
+        sketch = sketches[job_id]
+        matches = index.near_duplicates(sketch)
+        # Smallest id so every process picks the same cluster
+        cluster = min(cluster_of[match] for match in matches) if matches else job_id
+        clusters[job_id] = cluster
+        cluster_of[job_id] = cluster
+        index.add(job_id, sketch)
+        docs.append({
+            "_id": job_id,
+            "cluster_id": cluster,
+            "source": job.source,
+            "bands": band_keys(sketch.signature),
+            "signature": sketch.signature,
+            "head": sorted(sketch.head),
+            "first_seen": now,
+            "seen_at": now
+        })
+
+    try:
+        await collection.insert_many(docs, ordered=False)
+    except BulkWriteError:
+        # Another worker stored some of these jobs first; its cluster wins next time
+        pass
+    return clusters
+
+async def merge_reposts(jobs: List[HybridJob], source_priority: Optional[Dict[str, int]] = None, sketches: Optional[Dict[str, JobSketch]] = None) -> List[HybridJob]:
+    """
+    Drop jobs that belong to the same corpus cluster as a higher priority
+    (or earlier) job in the list. Falls back to the list unchanged if the
+    corpus is unavailable.
+    """
+    try:
+        clusters = await assign_clusters(jobs, sketches)
+    except Exception as e:
+        print(f"Near-duplicate corpus unavailable: {e}")
+        return jobs
+
+    deduplicator = Deduplicator(source_priority, clusters)
+    if sketches:
+        deduplicator.sketches.update(sketches)
     for job in jobs:
-        # 1. Check Link
-        if job.apply_link in seen_links:
-            continue
-            
-        # 2. Check Title + Company (Fuzzy or Exact)
-        # Simple normalization
-        t = job.title.lower().strip()
-        c = job.company.lower().strip()
-        key = (t, c)
-        
-        if key in seen_title_company:
-            continue
-            
-        # Add to unique list
-        unique_jobs.append(job)
-        seen_links.add(job.apply_link)
-        seen_title_company.add(key)
-        
-    return unique_jobs
+        deduplicator.add(job)
+    return deduplicator.jobs()
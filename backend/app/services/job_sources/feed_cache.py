@@ -0,0 +1,289 @@
+import asyncio
+import hashlib
+import tempfile
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Protocol
+from urllib.parse import urlencode
+from app.core import http_client, metrics
+from app.database import database
+from app.models.hybrid_job import HybridJob, job_from_cache
+from app.services.job_sources.registry import stream_progress
+from app.utils.token_index import TokenIndex, tokenize
+
+FEED_COLLECTION = "feed_snapshots"
+FEED_TTL_MINUTES = 30
+# Per-query feeds (WWR ?term=) each get a snapshot; keep memory bounded
+MAX_SNAPSHOTS = 200
+CHUNK_SIZE = 64 * 1024
+# Bodies spooled for the hash check move to a temp file beyond this size
+SPOOL_MAX_MEMORY = 4 * 1024 * 1024
+
+class FeedParser(Protocol):
+    """
+    Incremental parser: feed() is called with each chunk of the body,
+    close() returns the normalized jobs. jobs holds those completed so far.
+    """
+
+    jobs: List[HybridJob]
+
+    def feed(self, chunk: bytes) -> None: ...
+
+    def close(self) -> List[HybridJob]: ...
+
+class BufferedParser:
+    """
+    FeedParser for formats that need the whole document (HTML pages).
+    """
+
+    def __init__(self, parse: Callable[[str], List[HybridJob]]):
+        self.parse = parse
+        self.chunks: List[bytes] = []
+        self.jobs: List[HybridJob] = []
+
+    def feed(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+
+    def close(self) -> List[HybridJob]:
+        self.jobs = self.parse(b"".join(self.chunks).decode("utf-8", errors="replace"))
+        return self.jobs
+
+def job_text(job: HybridJob) -> str:
+    return f"{job.title} {job.company} {job.description}".lower()
+
+def text_matches(text: str, query: str, match_phrase: bool = False) -> bool:
+    """
+    FeedSnapshot.search for a single job text.
+    """
+    if match_phrase and query.strip():
+        return query.lower().strip() in text
+    return set(tokenize(query)) <= set(tokenize(text))
+
+class FeedSnapshot:
+    """
+    All normalized jobs of one feed download plus a token index over
+    title, company and description, so each query is a local lookup.
+    """
+
+    def __init__(self, key: str, jobs: List[HybridJob], fetched_at: datetime, validators: Optional[dict] = None):
+        self.key = key
+        self.jobs = jobs
+        self.fetched_at = fetched_at
+        # etag / last_modified from the response headers, content_hash of the body
+        self.validators = validators or {}
+        self.texts = [job_text(job) for job in jobs]
+        self.index = TokenIndex(self.texts)
+
+    def is_fresh(self, ttl: timedelta) -> bool:
+        return datetime.utcnow() - self.fetched_at < ttl
+
+    def search(self, query: str, match_phrase: bool = False) -> List[HybridJob]:
+        """
+        Jobs containing every query token. With match_phrase the query must
+        instead appear as-is (substring) in the job text.
+        """
+        tokens = tokenize(query)
+        if match_phrase and query.strip():
+            # The first and last words of a substring match may be partial,
+            # only the interior ones are guaranteed to be whole tokens
+            phrase = query.lower().strip()
+            positions = self.index.match_all(tokens[1:-1])
+            positions = [p for p in positions if phrase in self.texts[p]]
+        else:
+            positions = self.index.match_all(tokens)
+        return [self.jobs[p] for p in positions]
+
+_snapshots: Dict[str, FeedSnapshot] = {}
+_locks: Dict[str, asyncio.Lock] = {}
+
+async def _load_persisted(key: str) -> Optional[FeedSnapshot]:
+    doc = await database.get_collection(FEED_COLLECTION).find_one({"_id": key})
+    if not doc:
+        return None
+    jobs = [job_from_cache(job) for job in doc.get("jobs", [])]
+    return FeedSnapshot(key, jobs, doc["fetched_at"], doc.get("validators"))
+
+async def _persist(snapshot: FeedSnapshot) -> None:
+    await database.get_collection(FEED_COLLECTION).replace_one(
+        {"_id": snapshot.key},
+        {
+            # raw_data is excluded from dict(), the snapshot keeps it
+            "jobs": [{**job.dict(), "raw_data": job.raw_data} for job in snapshot.jobs],
+            "fetched_at": snapshot.fetched_at,
+            "validators": snapshot.validators
+        },
+        upsert=True
+    )
+
+async def _touch(snapshot: FeedSnapshot) -> None:
+    """
+    The feed did not change: extend the snapshot's freshness without
+    re-parsing or rewriting the jobs.
+    """
+    snapshot.fetched_at = datetime.utcnow()
+    await database.get_collection(FEED_COLLECTION).update_one(
+        {"_id": snapshot.key},
+        {"$set": {"fetched_at": snapshot.fetched_at, "validators": snapshot.validators}}
+    )
+
+def _conditional_headers(headers: Optional[dict], snapshot: Optional[FeedSnapshot]) -> dict:
+    request_headers = dict(headers or {})
+    if snapshot:
+        if snapshot.validators.get("etag"):
+            request_headers["If-None-Match"] = snapshot.validators["etag"]
+        if snapshot.validators.get("last_modified"):
+            request_headers["If-Modified-Since"] = snapshot.validators["last_modified"]
+    return request_headers
+
+def _store(snapshot: FeedSnapshot) -> None:
+    _snapshots[snapshot.key] = snapshot
+    if len(_snapshots) > MAX_SNAPSHOTS:
+        oldest = min(_snapshots.values(), key=lambda s: s.fetched_at)
+        _snapshots.pop(oldest.key, None)
+        _locks.pop(oldest.key, None)
+
+async def get_feed_snapshot(
+    source: str,
+    url: str,
+    new_parser: Callable[[], FeedParser],
+    headers: Optional[dict] = None,
+    params: Optional[dict] = None,
+    ttl: timedelta = timedelta(minutes=FEED_TTL_MINUTES),
+    on_jobs: Optional[Callable[[List[HybridJob]], None]] = None
+) -> FeedSnapshot:
+    """
+    Return a fresh snapshot of a feed.
+
+    Lookup order: in-memory, persisted (feed_snapshots), network. The feed
+    is downloaded and parsed at most once per TTL per process; a failed
+    refresh falls back to the last snapshot we have. new_parser returns a
+    fresh FeedParser for each download.
+
+    Refreshes are conditional (If-None-Match / If-Modified-Since). A 304, or
+    a body whose hash matches the last one, only extends the freshness of
+    the existing snapshot.
+
+    on_jobs, if given, is called with each batch of jobs as this call's
+    download parses them (not on snapshot hits).
+    """
+    key = f"{source}:{url}"
+    if params:
+        key += "?" + urlencode(sorted(params.items()))
+    snapshot = _snapshots.get(key)
+    if snapshot and snapshot.is_fresh(ttl):
+        metrics.increment(f"feed_cache.memory_hits.{source}")
+        return snapshot
+
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        # Another request may have refreshed it while we waited
+        snapshot = _snapshots.get(key)
+        if snapshot and snapshot.is_fresh(ttl):
+            metrics.increment(f"feed_cache.memory_hits.{source}")
+            return snapshot
+
+        # The ingestion worker may have persisted a newer snapshot
+        persisted = await database.get_collection(FEED_COLLECTION).find_one({"_id": key}, {"fetched_at": 1})
+        if persisted and (snapshot is None or persisted["fetched_at"] > snapshot.fetched_at):
+            snapshot = await _load_persisted(key)
+            if snapshot:
+                _store(snapshot)
+                if snapshot.is_fresh(ttl):
+                    metrics.increment(f"feed_cache.persisted_hits.{source}")
+                    return snapshot
+
+        metrics.increment(f"feed_cache.misses.{source}")
+        try:
+            request_headers = _conditional_headers(headers, snapshot)
+            async with http_client.stream(source, "GET", url, headers=request_headers, params=params) as response:
+                if response.status_code == 304 and snapshot:
+                    metrics.increment(f"feed_cache.not_modified.{source}")
+                    await _touch(snapshot)
+                    return snapshot
+
+                if response.status_code != 200:
+                    raise ValueError(f"status {response.status_code}")
+
+                validators = {
+                    "etag": response.headers.get("etag"),
+                    "last_modified": response.headers.get("last-modified"),
+                }
+
+                hasher = hashlib.sha256()
+                parser = None
+                reported = 0
+
+                async def parse(chunk: bytes) -> None:
+                    # The CPU work runs in a worker thread so large feeds do
+                    # not stall the event loop
+                    nonlocal reported
+                    await asyncio.to_thread(parser.feed, chunk)
+                    if on_jobs and len(parser.jobs) > reported:
+                        on_jobs(parser.jobs[reported:])
+                        reported = len(parser.jobs)
+                if snapshot and snapshot.validators.get("content_hash"):
+                    # The body may be the one we already have: spool it while
+                    # hashing and parse only once the hash turns out different
+                    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+                    try:
+                        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                            hasher.update(chunk)
+                            spool.write(chunk)
+                        validators["content_hash"] = hasher.hexdigest()
+                        if snapshot.validators["content_hash"] != validators["content_hash"]:
+                            parser = new_parser()
+                            spool.seek(0)
+                            while chunk := spool.read(CHUNK_SIZE):
+                                await parse(chunk)
+                    finally:
+                        spool.close()
+                else:
+                    # Nothing to compare with: parse while downloading
+                    parser = new_parser()
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        hasher.update(chunk)
+                        await parse(chunk)
+                    validators["content_hash"] = hasher.hexdigest()
+
+            if parser is None:
+                # Server has no validators (or ignored them) but the body is
+                # identical: keep the existing snapshot and its index
+                metrics.increment(f"feed_cache.unchanged.{source}")
+                snapshot.validators = validators
+                await _touch(snapshot)
+                return snapshot
+
+            jobs = await asyncio.to_thread(parser.close)
+            if on_jobs and len(jobs) > reported:
+                on_jobs(jobs[reported:])
+            snapshot = await asyncio.to_thread(FeedSnapshot, key, jobs, datetime.utcnow(), validators)
+        except Exception as e:
+            print(f"Error refreshing {source} feed: {e}")
+            if snapshot:
+                return snapshot
+            return FeedSnapshot(key, [], datetime.utcnow())
+
+        _store(snapshot)
+        await _persist(snapshot)
+        print(f"{source}: cached feed snapshot with {len(jobs)} jobs")
+        return snapshot
+
+async def stream_feed_jobs(
+    source: str,
+    url: str,
+    new_parser: Callable[[], FeedParser],
+    query: str,
+    match_phrase: bool = False,
+    **kwargs
+) -> AsyncIterator[HybridJob]:
+    """
+    The jobs get_feed_snapshot(...).search(query, match_phrase) returns,
+    yielded as the parser closes each item when the feed is downloaded,
+    or straight from the snapshot otherwise.
+    """
+    async def run(on_jobs):
+        snapshot = await get_feed_snapshot(source, url, new_parser, on_jobs=on_jobs, **kwargs)
+        return snapshot.search(query, match_phrase)
+
+    async for job in stream_progress(run, key=lambda job: job.job_id):
+        if text_matches(job_text(job), query, match_phrase):
+            yield job
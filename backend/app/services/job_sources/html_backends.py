@@ -0,0 +1,66 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+from app.core.config import settings
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+    print("Warning: lxml not installed. HTML scraping falls back to BeautifulSoup.")
+
+# One HN job row: (row id, link text, href)
+HNRow = Tuple[Optional[str], str, str]
+
+# XPath equivalent of BeautifulSoup's class_="..." (matches one class of many)
+ROW_XPATH = "//tr[contains(concat(' ', normalize-space(@class), ' '), ' athing ')]"
+TITLE_XPATH = ".//span[contains(concat(' ', normalize-space(@class), ' '), ' titleline ')]"
+
+def extract_hn_rows_bs4(content: str) -> List[HNRow]:
+    """
+    Pure Python fallback, always available.
+    """
+    soup = BeautifulSoup(content, "html.parser")
+    rows = []
+    for row in soup.find_all("tr", class_="athing"):
+        title_elem = row.find("span", class_="titleline")
+        if not title_elem:
+            continue
+        a_tag = title_elem.find("a")
+        if not a_tag or not a_tag.has_attr("href"):
+            continue
+        rows.append((row.get("id"), a_tag.get_text(strip=True), a_tag["href"]))
+    return rows
+
+def extract_hn_rows_lxml(content: str) -> List[HNRow]:
+    """
+    libxml2 based, several times faster than html.parser.
+    """
+    tree = lxml.html.fromstring(content)
+    rows = []
+    for row in tree.xpath(ROW_XPATH):
+        title_elems = row.xpath(TITLE_XPATH)
+        if not title_elems:
+            continue
+        a_tags = title_elems[0].iter("a")
+        a_tag = next(a_tags, None)
+        if a_tag is None or a_tag.get("href") is None:
+            continue
+        # Same text as get_text(strip=True): stripped, non-empty pieces joined
+        text = "".join(s.strip() for s in a_tag.itertext() if s.strip())
+        rows.append((row.get("id"), text, a_tag.get("href")))
+    return rows
+
+HN_BACKENDS: Dict[str, Callable[[str], List[HNRow]]] = {"bs4": extract_hn_rows_bs4}
+if LXML_AVAILABLE:
+    HN_BACKENDS["lxml"] = extract_hn_rows_lxml
+
+def get_hn_backend(name: Optional[str] = None) -> Callable[[str], List[HNRow]]:
+    """
+    Resolve a backend by name; "auto" picks the fastest one installed.
+    Unknown or unavailable names fall back to bs4.
+    """
+    name = name or settings.HTML_PARSER_BACKEND
+    if name == "auto":
+        name = "lxml" if LXML_AVAILABLE else "bs4"
+    return HN_BACKENDS.get(name, extract_hn_rows_bs4)
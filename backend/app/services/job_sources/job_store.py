@@ -0,0 +1,113 @@
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from bson.binary import Binary
+from pymongo import UpdateOne
+from app.core.config import settings
+from app.database import database
+from app.models.hybrid_job import HybridJob, job_from_cache
+from app.services.job_sources.normalize import job_fingerprint
+
+# One document per posting, _id = job_fingerprint. Query caches store
+# ordered lists of these ids instead of embedded copies.
+JOBS_COLLECTION = "jobs"
+# Source payloads (HybridJob.raw_data), same _id, read only on demand
+RAW_COLLECTION = "job_raw_payloads"
+
+# Store bookkeeping (and legacy raw_data) that hydration does not need
+HYDRATE_PROJECTION = {"raw_data": 0, "first_seen_at": 0, "last_seen_at": 0}
+
+async def save_jobs(jobs: List[HybridJob]) -> List[str]:
+    """
+    Upsert jobs into the canonical store and return their ids in order.
+    raw_data goes to the raw payload collection.
+    """
+    if not jobs:
+        return []
+
+    now = datetime.utcnow()
+    ids = []
+    operations = []
+    payloads = {}
+    for job in jobs:
+        job_id = job_fingerprint(job)
+        ids.append(job_id)
+        operations.append(UpdateOne(
+            {"_id": job_id},
+            {
+                "$set": {**job.dict(), "last_seen_at": now},
+                "$setOnInsert": {"first_seen_at": now},
+                # Documents written before payloads were split out
+                "$unset": {"raw_data": ""}
+            },
+            upsert=True
+        ))
+        if job.raw_data:
+            payloads[job_id] = (job, job.raw_data)
+
+    await database.get_collection(JOBS_COLLECTION).bulk_write(operations, ordered=False)
+    await save_raw_payloads(payloads)
+    return ids
+
+async def load_jobs(ids: List[str]) -> List[HybridJob]:
+    """
+    Hydrate ids with one batched $in lookup, keeping their order. Ids no
+    longer in the store are skipped.
+    """
+    if not ids:
+        return []
+
+    found: Dict[str, dict] = {}
+    cursor = database.get_collection(JOBS_COLLECTION).find({"_id": {"$in": list(set(ids))}}, HYDRATE_PROJECTION)
+    async for doc in cursor:
+        found[doc.pop("_id")] = doc
+
+    # Written by save_jobs from validated jobs, no need to validate again
+    return [job_from_cache(found[job_id]) for job_id in ids if job_id in found]
+
+def find_jobs(query: Optional[dict] = None, projection: Optional[dict] = None):
+    """
+    Cursor over the stored corpus, most recently seen first (served by the
+    last_seen_at index). raw_data of legacy documents is never included.
+    """
+    return database.get_collection(JOBS_COLLECTION).find(query or {}, projection or {"raw_data": 0}).sort("last_seen_at", -1)
+
+def _encode_payload(data: Dict[str, Any]) -> dict:
+    if not settings.RAW_PAYLOAD_COMPRESSION:
+        return {"data": data, "compressed": False}
+    raw = json.dumps(data, default=str).encode()
+    return {"data": Binary(zlib.compress(raw)), "compressed": True}
+
+def _decode_payload(doc: dict) -> Dict[str, Any]:
+    if doc.get("compressed"):
+        return json.loads(zlib.decompress(doc["data"]))
+    return doc["data"]
+
+async def save_raw_payloads(payloads: Dict[str, tuple]) -> None:
+    """
+    payloads maps fingerprint -> (job, raw_data).
+    """
+    if not payloads:
+        return
+
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"_id": fingerprint},
+            {"$set": {"job_id": job.job_id, "source": job.source, "stored_at": now, **_encode_payload(raw_data)}},
+            upsert=True
+        )
+        for fingerprint, (job, raw_data) in payloads.items()
+    ]
+    await database.get_collection(RAW_COLLECTION).bulk_write(operations, ordered=False)
+
+async def load_raw_payload(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Source payload of a job, by its source job_id (as shown to clients).
+    """
+    doc = await database.get_collection(RAW_COLLECTION).find_one(
+        {"job_id": job_id},
+        sort=[("stored_at", -1)]
+    )
+    return _decode_payload(doc) if doc else None
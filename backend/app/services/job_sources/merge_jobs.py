@@ -1,99 +1,589 @@
 import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.core import metrics
+from app.core.cache import hot_cache
+from app.core.config import settings
 from app.database import database
-from app.models.hybrid_job import HybridJob
-from app.services.job_sources.api_jobs import fetch_jsearch_jobs
-from app.services.job_sources.scrape_remoteok import scrape_remoteok
-from app.services.job_sources.scrape_wwr import scrape_wwr
-from app.services.job_sources.scrape_hn_jobs import scrape_hn_jobs
-from app.services.job_sources.deduplicate import deduplicate_jobs
+from app.models.hybrid_job import HybridJob, job_from_cache
+from app.utils.query_normalizer import canonical_key, expand_tokens, normalize_location, query_tokens, raw_key, record_key
+from app.utils.token_index import TokenIndex
+from app.utils.single_flight import SingleFlight, acquire_lease, release_lease
+from app.services.job_sources.registry import JobSource, get_sources, get_source_priorities
+from app.services.job_sources.deduplicate import Deduplicator, merge_reposts
+from app.services.job_sources.job_store import load_jobs, save_jobs
+from app.services.job_sources.normalize import job_fingerprint
 
 CACHE_COLLECTION = "hybrid_jobs_cache"
+QUERY_STATS_COLLECTION = "search_queries"
+LEASE_COLLECTION = "cache_leases"
 CACHE_DURATION_HOURS = 6
+# Entries older than CACHE_DURATION_HOURS but younger than this are still
+# served (stale-while-revalidate) while a refresh runs in the background
+STALE_DURATION_HOURS = 48
+# A lease holder that crashed blocks other workers for at most this long
+LEASE_TTL_SECONDS = 30
+LEASE_POLL_SECONDS = 0.5
+# A partial entry still partial after this long gets refreshed again
+PARTIAL_RETRY_SECONDS = 60
+# Hydrated pages kept in process memory (other workers' refreshes show up
+# after this long); misses are not kept, the refresh path handles them
+HOT_CACHE_NAMESPACE = "hybrid"
+hot_cache.namespace(HOT_CACHE_NAMESPACE, ttl=60)
+# A narrower query filtered from a cached broader one needs at least this
+# many matches, otherwise the sources are asked directly
+MIN_REFINEMENT_RESULTS = 10
 
-async def get_hybrid_jobs(query: str, location: str = "", remote: bool = False) -> Dict[str, Any]:
+# Keep references to fire-and-forget tasks so they are not garbage collected
+_background_tasks = set()
+# Concurrent refreshes of the same cache key share one source fan-out
+_refresh_flight = SingleFlight("hybrid_jobs")
+# Fan-outs still inside their deadline, by cache key, so streaming callers
+# can follow the refresh in flight instead of starting their own
+_live_fanouts: Dict[str, "SourceFanout"] = {}
+_fanout_waiters: Dict[str, List[asyncio.Future]] = {}
+
+def build_cache_key(query: str, location: str = "", remote: bool = False) -> str:
+    # Spellings of the same search ("Python Dev", "developer python") share an entry
+    return canonical_key(query, location, remote)
+
+def search_fields(query: str, location: str = "", remote: bool = False) -> Dict[str, Any]:
+    # Stored on cache entries so narrower queries can find them
+    tokens = query_tokens(query)
+    return {"query_tokens": tokens, "token_count": len(tokens), "location_key": normalize_location(location), "remote": remote}
+
+def run_in_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+async def record_query(cache_key: str, query: str, location: str, remote: bool) -> None:
     """
-    Fetch jobs from multiple sources, merge, deduplicate, and cache.
+    Count searches per cache key so the ingestion scheduler knows which
+    queries are popular enough to keep warm. raw_keys lists the spellings
+    that collapsed into the key.
+    """
+    record_key(query, location, remote, cache_key)
+    await database.get_collection(QUERY_STATS_COLLECTION).update_one(
+        {"query_key": cache_key},
+        {
+            "$set": {"query": query, "location": location, "remote": remote, "last_requested_at": datetime.utcnow()},
+            "$inc": {"count": 1},
+            "$addToSet": {"raw_keys": raw_key(query, location, remote)}
+        },
+        upsert=True
+    )
+
+def trigger_refresh(query: str, location: str = "", remote: bool = False) -> None:
+    """
+    Start a background refresh for a query unless one is already running.
+    """
+    cache_key = build_cache_key(query, location, remote)
+    if _refresh_flight.is_running(cache_key):
+        return
+
+    async def _refresh():
+        try:
+            await refresh_hybrid_jobs(query, location, remote)
+        except Exception as e:
+            print(f"Background refresh failed for {cache_key}: {e}")
+
+    run_in_background(_refresh())
+
+async def _result_from_cache(cache_entry: dict) -> Dict[str, Any]:
+    if "job_ids" in cache_entry:
+        jobs = await load_jobs(cache_entry["job_ids"])
+    else:
+        # Entry written before the canonical job store: jobs are embedded
+        jobs = [job_from_cache(job) for job in cache_entry.get("jobs", [])]
+    return {
+        "jobs": jobs,
+        # job_ids may be a page slice, total counts the whole entry
+        "total": cache_entry.get("total", len(jobs)),
+        "sources_used": cache_entry.get("sources_used", []),
+        "from_cache": True,
+        "partial": cache_entry.get("partial", False),
+        "missing_sources": cache_entry.get("missing_sources", [])
+    }
+
+async def _read_entry(cache_key: str, skip: int = 0, limit: Optional[int] = None) -> Optional[dict]:
+    """
+    Read a cache entry and hydrate its jobs (the result of get_hybrid_jobs
+    plus fetched_at). With limit, only job_ids[skip:skip + limit] are read.
+    """
+    cache = database.get_collection(CACHE_COLLECTION)
+    projection = None
+    if limit is not None:
+        projection = {"job_ids": {"$slice": [skip, limit]}, "jobs": {"$slice": [skip, limit]}}
+    cache_entry = await cache.find_one({"query_key": cache_key}, projection)
+    if not cache_entry:
+        return None
+    if projection and "total" not in cache_entry:
+        # Written before totals were stored, a slice would hide the size
+        cache_entry = await cache.find_one({"query_key": cache_key})
+        field = "job_ids" if "job_ids" in cache_entry else "jobs"
+        cache_entry["total"] = len(cache_entry.get(field, []))
+        cache_entry[field] = cache_entry.get(field, [])[skip:skip + limit]
+    return {**await _result_from_cache(cache_entry), "fetched_at": cache_entry.get("fetched_at")}
+
+def _hot_key(cache_key: str, skip: int, limit: Optional[int]) -> str:
+    return f"{cache_key}|{skip}|{limit}"
+
+def invalidate_hot_entries(cache_key: str) -> None:
+    # Every cached page of the key, in this process
+    hot_cache.invalidate(HOT_CACHE_NAMESPACE, f"{cache_key}|")
+
+async def _load_cached(cache_key: str, query: str, location: str, remote: bool, skip: int = 0, limit: Optional[int] = None) -> Optional[dict]:
+    """
+    Return the hydrated cache entry if it can be served (fresh or stale),
+    starting a background refresh when it is stale or still partial. None
+    on a miss. Served from the in-process tier when it has the page.
+    """
+    cache_entry = await hot_cache.get_or_load(
+        HOT_CACHE_NAMESPACE,
+        _hot_key(cache_key, skip, limit),
+        lambda: _read_entry(cache_key, skip, limit)
+    )
+    if not cache_entry:
+        return None
+
+    fetched_at = cache_entry.get("fetched_at")
+    age = datetime.utcnow() - fetched_at if fetched_at else None
+    if age is None or age >= timedelta(hours=STALE_DURATION_HOURS):
+        return None
+
+    if age < timedelta(hours=CACHE_DURATION_HOURS):
+        print(f"Serving from cache: {cache_key}")
+        if cache_entry.get("partial") and age > timedelta(seconds=PARTIAL_RETRY_SECONDS):
+            # The backfill never landed (worker restarted, sources failed)
+            trigger_refresh(query, location, remote)
+    else:
+        print(f"Serving stale cache, refreshing in background: {cache_key}")
+        trigger_refresh(query, location, remote)
+    return cache_entry
+
+def _copy_result(cache_entry: dict) -> Dict[str, Any]:
+    # Hot entries are shared: hand out fresh lists (jobs themselves are not mutated)
+    result = {key: value for key, value in cache_entry.items() if key != "fetched_at"}
+    return {**result, "jobs": list(result["jobs"]), "sources_used": list(result["sources_used"]), "missing_sources": list(result["missing_sources"])}
+
+async def get_hybrid_jobs(query: str, location: str = "", remote: bool = False, skip: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Serve jobs for a query from the cache corpus.
+
+    Fresh entries are returned as-is. Stale entries are returned immediately
+    and refreshed in the background. Only a query we have never seen (or one
+    older than the stale window) waits for the sources.
+
+    With limit, "jobs" holds only that page and "total" the full count;
+    cache hits then read and hydrate just the page.
     """
     # Create a cache key
-    cache_key = f"{query.lower()}_{location.lower()}_{remote}"
+    cache_key = build_cache_key(query, location, remote)
+    run_in_background(record_query(cache_key, query, location, remote))
     
     # 1. Check Cache
-    cache_entry = await database.get_collection(CACHE_COLLECTION).find_one({"query_key": cache_key})
-    
+    cache_entry = await _load_cached(cache_key, query, location, remote, skip, limit)
     if cache_entry:
-        fetched_at = cache_entry.get("fetched_at")
-        if fetched_at and (datetime.utcnow() - fetched_at) < timedelta(hours=CACHE_DURATION_HOURS):
-            print(f"Serving from cache: {cache_key}")
-            # Convert dicts back to HybridJob objects
-            jobs = [HybridJob(**job) for job in cache_entry.get("jobs", [])]
-            return {
-                "jobs": jobs,
-                "sources_used": cache_entry.get("sources_used", []),
-                "from_cache": True
-            }
-            
+        return _copy_result(cache_entry)
+
+    result = await refresh_hybrid_jobs(query, location, remote)
+    if limit is not None:
+        result["jobs"] = result["jobs"][skip:skip + limit]
+    return result
+
+async def stream_hybrid_jobs(query: str, location: str = "", remote: bool = False) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of get_hybrid_jobs. Yields {"event": "job", "job",
+    "replaces"} for each deduplicated job as soon as a source delivers it
+    (replaces lists job_ids of earlier jobs it superseded), then one
+    {"event": "summary", ...} with the same fields as get_hybrid_jobs.
+
+    A miss goes through refresh_hybrid_jobs like get_hybrid_jobs (single
+    flight, lease, refinement); when that refresh runs a fan-out in this
+    process, every streaming caller follows the same one. Cache hits and
+    refreshes served without a local fan-out are replayed from their result.
+    """
+    cache_key = build_cache_key(query, location, remote)
+    run_in_background(record_query(cache_key, query, location, remote))
+
+    cache_entry = await _load_cached(cache_key, query, location, remote)
+    result = _copy_result(cache_entry) if cache_entry else None
+    if result is None:
+        # Runs on its own: a client going away does not stop the refresh
+        refresh = run_in_background(refresh_hybrid_jobs(query, location, remote))
+        fanout = await _attach_fanout(cache_key, refresh)
+        if fanout is not None:
+            print(f"Streaming fresh data for: {cache_key}")
+            async for job, replaced in fanout.follow():
+                yield {"event": "job", "job": job, "replaces": [old.job_id for old in replaced]}
+            result = await asyncio.shield(refresh)
+            yield {"event": "summary", **{k: v for k, v in result.items() if k != "jobs"}, "total": len(result["jobs"])}
+            return
+        result = await asyncio.shield(refresh)
+
+    for job in result["jobs"]:
+        yield {"event": "job", "job": job, "replaces": []}
+    yield {"event": "summary", **{k: v for k, v in result.items() if k != "jobs"}, "total": len(result["jobs"])}
+
+def _publish_fanout(cache_key: str, fanout: "SourceFanout") -> None:
+    _live_fanouts[cache_key] = fanout
+    for waiter in _fanout_waiters.pop(cache_key, []):
+        if not waiter.done():
+            waiter.set_result(fanout)
+
+def _retire_fanout(cache_key: str, fanout: "SourceFanout") -> None:
+    fanout.cut()
+    if _live_fanouts.get(cache_key) is fanout:
+        del _live_fanouts[cache_key]
+
+async def _attach_fanout(cache_key: str, refresh: asyncio.Task) -> Optional["SourceFanout"]:
+    """
+    The fan-out this process runs for cache_key, waiting for the refresh to
+    start one. None when the refresh finishes without one (refinement,
+    another worker holding the lease, an error).
+    """
+    fanout = _live_fanouts.get(cache_key)
+    if fanout is not None:
+        return fanout
+    waiter = asyncio.get_running_loop().create_future()
+    _fanout_waiters.setdefault(cache_key, []).append(waiter)
+    try:
+        await asyncio.wait({waiter, refresh}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiters = _fanout_waiters.get(cache_key, [])
+        if waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del _fanout_waiters[cache_key]
+    if waiter.done() and not waiter.cancelled():
+        return waiter.result()
+    waiter.cancel()
+    return None
+
+async def _find_broader(search: dict) -> Optional[dict]:
+    """
+    The narrowest fresh, complete cache entry whose query tokens are a
+    strict subset of the search's ("python" for "python django"). The
+    subset test runs in Mongo: no token outside the search's, and fewer.
+    """
+    tokens = search["query_tokens"]
+    if len(tokens) < 2:
+        return None
+
+    return await database.get_collection(CACHE_COLLECTION).find_one(
+        {
+            "location_key": search["location_key"],
+            "remote": search["remote"],
+            "token_count": {"$gte": 1, "$lt": len(tokens)},
+            "query_tokens": {"$not": {"$elemMatch": {"$nin": tokens}}},
+            "partial": {"$ne": True},
+            "fetched_at": {"$gte": datetime.utcnow() - timedelta(hours=CACHE_DURATION_HOURS)}
+        },
+        {"query_key": 1, "query_tokens": 1},
+        sort=[("token_count", -1)]
+    )
+
+def _job_text(job: HybridJob) -> str:
+    return " ".join(expand_tokens(f"{job.title} {job.company} {job.location} {job.description}"))
+
+async def refine_from_broader(query: str, location: str = "", remote: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Serve a refinement of a cached query without calling the sources: the
+    broader entry's jobs are filtered locally with a token index and the
+    match is stored as this query's entry (same fetched_at, so it ages with
+    its source). None when there is no broader entry or fewer than
+    MIN_REFINEMENT_RESULTS jobs match.
+    """
+    search = search_fields(query, location, remote)
+    broader = await _find_broader(search)
+    if broader is None:
+        return None
+
+    entry = await hot_cache.get_or_load(
+        HOT_CACHE_NAMESPACE,
+        _hot_key(broader["query_key"], 0, None),
+        lambda: _read_entry(broader["query_key"])
+    )
+    if not entry:
+        return None
+
+    jobs = entry["jobs"]
+    positions = TokenIndex(_job_text(job) for job in jobs).match_all(search["query_tokens"])
+    if len(positions) < MIN_REFINEMENT_RESULTS:
+        metrics.increment("hybrid_jobs.refinement_fallbacks")
+        return None
+
+    cache_key = build_cache_key(query, location, remote)
+    refined = [jobs[position] for position in positions]
+    print(f"Refined {cache_key} from {broader['query_key']}: {len(refined)} of {len(jobs)} jobs")
+    metrics.increment("hybrid_jobs.refinement_hits")
+
+    await database.get_collection(CACHE_COLLECTION).update_one(
+        {"query_key": cache_key},
+        {
+            "$set": {
+                "query_key": cache_key,
+                "job_ids": [job_fingerprint(job) for job in refined],
+                "total": len(refined),
+                "sources_used": list(entry["sources_used"]),
+                "partial": False,
+                "missing_sources": [],
+                "fetched_at": entry["fetched_at"],
+                "refined_from": broader["query_key"],
+                **search
+            },
+            "$unset": {"jobs": ""}
+        },
+        upsert=True
+    )
+    invalidate_hot_entries(cache_key)
+
+    return {
+        "jobs": refined,
+        "total": len(refined),
+        "sources_used": list(entry["sources_used"]),
+        "from_cache": True,
+        "partial": False,
+        "missing_sources": []
+    }
+
+async def refresh_hybrid_jobs(query: str, location: str = "", remote: bool = False, refine: bool = True) -> Dict[str, Any]:
+    """
+    Refresh a cache entry. Concurrent callers for the same key in this
+    process await a single fetch; with CACHE_LEASES_ENABLED, workers also
+    coordinate through a lease document so only one of them fetches.
+    refine=False always asks the sources (the scheduler's refresh-ahead
+    must not be served from an older broader entry).
+    """
+    cache_key = build_cache_key(query, location, remote)
+
+    async def _refresh():
+        refined = await refine_from_broader(query, location, remote) if refine else None
+        if refined is not None:
+            return refined
+        if not settings.CACHE_LEASES_ENABLED:
+            return await fetch_hybrid_jobs(query, location, remote)
+        return await _fetch_with_lease(cache_key, query, location, remote)
+
+    result = await _refresh_flight.do(cache_key, _refresh)
+    # Coalesced callers share the result; give each its own lists to mutate
+    return {**result, "jobs": list(result["jobs"]), "sources_used": list(result["sources_used"])}
+
+async def _fetch_with_lease(cache_key: str, query: str, location: str, remote: bool) -> Dict[str, Any]:
+    leases = database.get_collection(LEASE_COLLECTION)
+    started = datetime.utcnow()
+    deadline = started + timedelta(seconds=LEASE_TTL_SECONDS)
+
+    while not await acquire_lease(leases, cache_key, LEASE_TTL_SECONDS):
+        # Another worker is fetching this key, wait for its cache write
+        metrics.increment("single_flight.lease_waits.hybrid_jobs")
+        await asyncio.sleep(LEASE_POLL_SECONDS)
+        cache_entry = await database.get_collection(CACHE_COLLECTION).find_one(
+            {"query_key": cache_key, "fetched_at": {"$gte": started}}
+        )
+        if cache_entry:
+            return await _result_from_cache(cache_entry)
+        if datetime.utcnow() > deadline:
+            # Holder is stuck or gone; the lease has expired by now
+            break
+
+    try:
+        return await fetch_hybrid_jobs(query, location, remote)
+    finally:
+        await release_lease(leases, cache_key)
+
+class SourceFanout:
+    """
+    One run over every registered source. Each source streams into a shared
+    queue and jobs are deduplicated as they are consumed, so the first jobs
+    are available as soon as the fastest source yields them.
+
+    events() drives the run (one consumer). Every accepted job is also kept
+    in a log that any number of follow() callers replay, up to cut().
+    """
+
+    def __init__(self, query: str, location: str = "", remote: bool = False):
+        self.search = search_fields(query, location, remote)
+        self.sources = get_sources()
+        self.deduplicator = Deduplicator({source.name: source.priority for source in self.sources})
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.counts: Dict[str, int] = {}
+        self.finished: set = set()
+        self.accepted: List[Tuple[HybridJob, List[HybridJob]]] = []
+        # Length of the log that belongs to the result; None while running
+        self.cutoff: Optional[int] = None
+        self._progress = asyncio.Event()
+        self.tasks = {
+            source.name: asyncio.create_task(self._pump(source, query, location, remote))
+            for source in self.sources
+        }
+
+    async def _pump(self, source: JobSource, query: str, location: str, remote: bool) -> None:
+        try:
+            async for job in source.stream(query, location, remote):
+                self.queue.put_nowait((source.name, job))
+        except Exception as e:
+            print(f"Source {source.name} failed: {e}")
+        finally:
+            # None marks the end of this source's stream
+            self.queue.put_nowait((source.name, None))
+
+    async def events(self, timeout: Optional[float] = None) -> AsyncIterator[Tuple[HybridJob, List[HybridJob]]]:
+        """
+        Yield (job, replaced) for every job that survives deduplication, until
+        all sources are done or timeout seconds have passed. Can be resumed
+        by calling it again after a timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        while len(self.finished) < len(self.tasks):
+            remaining = deadline - loop.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                return
+            try:
+                name, job = await asyncio.wait_for(self.queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+            if job is None:
+                self.finished.add(name)
+                continue
+            self.counts[name] = self.counts.get(name, 0) + 1
+            accepted, replaced = self.deduplicator.add(job)
+            if accepted:
+                self.accepted.append((job, replaced))
+                self._notify()
+                yield job, replaced
+
+    async def run(self, timeout: Optional[float] = None) -> None:
+        async for _ in self.events(timeout):
+            pass
+
+    def cut(self) -> None:
+        """
+        End the part of the run followers see (the deadline result);
+        later jobs only go to the backfill.
+        """
+        if self.cutoff is None:
+            self.cutoff = len(self.accepted)
+            self._notify()
+
+    async def follow(self) -> AsyncIterator[Tuple[HybridJob, List[HybridJob]]]:
+        """
+        Replay the accepted (job, replaced) pairs from the start, then wait
+        for new ones until cut().
+        """
+        position = 0
+        while True:
+            end = len(self.accepted) if self.cutoff is None else self.cutoff
+            while position < end:
+                yield self.accepted[position]
+                position += 1
+            if self.cutoff is not None:
+                return
+            await self._progress.wait()
+
+    def _notify(self) -> None:
+        self._progress.set()
+        self._progress = asyncio.Event()
+
+    @property
+    def sources_used(self) -> List[str]:
+        return [source.name for source in self.sources if self.counts.get(source.name)]
+
+    @property
+    def missing_sources(self) -> List[str]:
+        return [source.name for source in self.sources if source.name not in self.finished]
+
+    def jobs(self) -> List[HybridJob]:
+        return self.deduplicator.jobs()
+
+async def fetch_hybrid_jobs(query: str, location: str = "", remote: bool = False) -> Dict[str, Any]:
+    """
+    Fetch jobs from multiple sources, merge, deduplicate, and cache.
+
+    Sources get HYBRID_DEADLINE_SECONDS to answer. Whatever has arrived by
+    then is returned and cached with partial=True; the slow sources keep
+    running in the background and backfill the cache entry when they finish.
+    """
+    cache_key = build_cache_key(query, location, remote)
+
     # 2. Fetch from Sources
     print(f"Fetching fresh data for: {cache_key}")
-    
-    tasks = [
-        fetch_jsearch_jobs(query, location, remote),
-        scrape_remoteok(query),
-        scrape_wwr(query),
-        scrape_hn_jobs(query)
-    ]
-    
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    all_jobs = []
-    sources_used = []
-    
-    # Process Results
-    # 0: API
-    if isinstance(results[0], list):
-        all_jobs.extend(results[0])
-        if results[0]: sources_used.append("api")
-        
-    # 1: RemoteOK
-    if isinstance(results[1], list):
-        all_jobs.extend(results[1])
-        if results[1]: sources_used.append("remoteok")
-        
-    # 2: WWR
-    if isinstance(results[2], list):
-        all_jobs.extend(results[2])
-        if results[2]: sources_used.append("wwr")
-        
-    # 3: HN
-    if isinstance(results[3], list):
-        all_jobs.extend(results[3])
-        if results[3]: sources_used.append("hn")
-        
-    # 3. Deduplicate
-    unique_jobs = deduplicate_jobs(all_jobs)
-    
-    # 4. Sort (Date DESC, then API priority implicitly via dedupe sort, but let's sort by date if available)
+
+    fanout = SourceFanout(query, location, remote)
+    _publish_fanout(cache_key, fanout)
+    try:
+        await fanout.run(timeout=settings.HYBRID_DEADLINE_SECONDS)
+    finally:
+        _retire_fanout(cache_key, fanout)
+
+    missing_sources = fanout.missing_sources
+    unique_jobs = await _store_results(cache_key, fanout.jobs(), fanout.sources_used, missing_sources, fanout.deduplicator.sketches, fanout.search)
+
+    if missing_sources:
+        # Started only once the partial entry is written, so the complete
+        # backfill is always the later write
+        print(f"Deadline reached for {cache_key}, missing: {missing_sources}")
+        metrics.increment("hybrid_jobs.partial_responses")
+        run_in_background(_backfill(cache_key, fanout))
+
+    return {
+        "jobs": unique_jobs,
+        "total": len(unique_jobs),
+        "sources_used": fanout.sources_used,
+        "from_cache": False,
+        "partial": bool(missing_sources),
+        "missing_sources": missing_sources
+    }
+
+async def _store_results(cache_key: str, unique_jobs: List[HybridJob], sources_used: List[str], missing_sources: List[str], sketches: Optional[dict] = None, search: Optional[dict] = None) -> List[HybridJob]:
+    # 3. Merge reposts and near duplicates known from earlier fetches
+    unique_jobs = await merge_reposts(unique_jobs, get_source_priorities(), sketches)
+
+    # 4. Sort (Date DESC, then API priority implicitly via dedupe order)
     # Jobs without date go to bottom? Or top? Let's put them at bottom.
-    unique_jobs.sort(key=lambda x: x.published_at or datetime.min, reverse=True)
+    unique_jobs = sorted(unique_jobs, key=lambda x: x.published_at or datetime.min, reverse=True)
     
-    # 5. Cache
+    # Jobs the deduplicator kept apart can still share a store id; keep the
+    # first (newest) so the response and the cache entry list the same jobs
+    by_id = {}
+    for job in unique_jobs:
+        by_id.setdefault(job_fingerprint(job), job)
+    unique_jobs = list(by_id.values())
+
+    # 5. Cache: jobs go to the canonical store, the entry keeps their ids
+    job_ids = await save_jobs(unique_jobs)
     cache_data = {
         "query_key": cache_key,
-        "jobs": [job.dict() for job in unique_jobs],
+        "job_ids": job_ids,
+        "total": len(job_ids),
         "sources_used": sources_used,
-        "fetched_at": datetime.utcnow()
+        "partial": bool(missing_sources),
+        "missing_sources": missing_sources,
+        "fetched_at": datetime.utcnow(),
+        **(search or {})
     }
     
     # Upsert cache
     await database.get_collection(CACHE_COLLECTION).update_one(
         {"query_key": cache_key},
-        {"$set": cache_data},
+        {"$set": cache_data, "$unset": {"jobs": ""}},
         upsert=True
     )
-    
-    return {
-        "jobs": unique_jobs,
-        "sources_used": sources_used,
-        "from_cache": False
-    }
+    invalidate_hot_entries(cache_key)
+
+    return unique_jobs
+
+async def _backfill(cache_key: str, fanout: SourceFanout) -> None:
+    """
+    Wait for the sources that missed the deadline and rewrite the cache
+    entry with the complete result, so the next request is not partial.
+    """
+    late = fanout.missing_sources
+    await fanout.run()
+    await _store_results(cache_key, fanout.jobs(), fanout.sources_used, [], fanout.deduplicator.sketches, fanout.search)
+    metrics.increment("hybrid_jobs.backfills")
+    print(f"Backfilled {cache_key}: late sources {late}, with results from {[s for s in late if s in fanout.sources_used]}")
@@ -1,7 +1,20 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from app.models.hybrid_job import HybridJob
+from app.utils.minhash import normalize_tokens
 from datetime import datetime, timezone
 from typing import Dict, Any, List
 
+# Query parameters that only track the click, not the job. Matched
+# exactly (reference=, sourceId=, src_job= can identify the posting);
+# only the utm_ family is matched by prefix.
+TRACKING_PARAMS = {
+    "ref", "referrer", "source", "src",
+    "gclid", "fbclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+}
+TRACKING_PARAM_PREFIXES = ("utm_",)
+
 def normalize_job_data(
     job_id: str,
     title: str,
@@ -36,3 +49,38 @@ def normalize_job_data(
         raw_data=raw_data,
         fetched_at=datetime.utcnow()
     )
+
+def stable_hash(*parts: str) -> str:
+    """
+    Short hex digest that is the same in every process (unlike hash(),
+    which changes with PYTHONHASHSEED).
+    """
+    return hashlib.sha1("\x1f".join(part or "" for part in parts).encode()).hexdigest()[:16]
+
+def is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PARAM_PREFIXES)
+
+def canonical_link(url: str) -> str:
+    """
+    apply_link without scheme/host case differences, fragments, trailing
+    slashes or tracking parameters.
+    """
+    if not url or url == "#":
+        return ""
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query) if not is_tracking_param(k)]
+    return urlunsplit(("", parts.netloc.lower(), parts.path.rstrip("/"), urlencode(sorted(query)), ""))
+
+def job_fingerprint(job: HybridJob) -> str:
+    """
+    Stable identity of a posting in the canonical job store: source,
+    cleaned apply link and normalized title and company. Description edits
+    keep the fingerprint, so a refetched job updates its document.
+    """
+    return stable_hash(
+        job.source,
+        canonical_link(job.apply_link),
+        " ".join(normalize_tokens(job.title)),
+        " ".join(normalize_tokens(job.company))
+    )
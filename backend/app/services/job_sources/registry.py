@@ -0,0 +1,88 @@
+import asyncio
+import importlib
+import pkgutil
+from datetime import timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from app.models.hybrid_job import HybridJob
+
+# Sources register themselves when their module is imported. Every module
+# of this package is imported by load_sources, so adding a source means
+# dropping in a module with a @register_source generator.
+SOURCE_PACKAGE = "app.services.job_sources"
+
+SourceStream = Callable[[str, str, bool], AsyncIterator[HybridJob]]
+
+class JobSource:
+    """
+    A registered job source.
+
+    stream(query, location, remote) is an async generator of normalized
+    jobs. priority decides which copy survives deduplication (lower wins).
+    query_specific is False for feeds downloaded once and filtered locally;
+    ttl is how long the source's own cache keeps a result.
+    """
+
+    def __init__(self, name: str, stream: SourceStream, priority: int, query_specific: bool, ttl: Optional[timedelta]):
+        self.name = name
+        self.stream = stream
+        self.priority = priority
+        self.query_specific = query_specific
+        self.ttl = ttl
+
+_sources: Dict[str, JobSource] = {}
+_loaded = False
+# Refreshes started by stream_progress keep running if the stream is dropped
+_background_tasks = set()
+
+def register_source(name: str, priority: int, query_specific: bool = True, ttl: Optional[timedelta] = None):
+    """
+    Decorator registering an async generator function as a job source.
+    """
+    def decorator(stream: SourceStream) -> SourceStream:
+        _sources[name] = JobSource(name, stream, priority, query_specific, ttl)
+        return stream
+    return decorator
+
+def load_sources() -> None:
+    global _loaded
+    if _loaded:
+        return
+    package = importlib.import_module(SOURCE_PACKAGE)
+    for module in pkgutil.iter_modules(package.__path__, f"{SOURCE_PACKAGE}."):
+        importlib.import_module(module.name)
+    _loaded = True
+
+def get_sources() -> List[JobSource]:
+    """
+    All registered sources, highest priority first.
+    """
+    load_sources()
+    return sorted(_sources.values(), key=lambda source: source.priority)
+
+def get_source_priorities() -> Dict[str, int]:
+    return {source.name: source.priority for source in get_sources()}
+
+async def stream_progress(
+    run: Callable[[Callable[[List[Any]], None]], Awaitable[List[Any]]],
+    key: Callable[[Any], Any]
+) -> AsyncIterator[Any]:
+    """
+    Yield items as run reports them through its callback, then the items of
+    its result that were not reported (e.g. run joined a refresh already in
+    flight, or served a cache). Items are told apart by key(item).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(run(queue.put_nowait))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    # None marks the end of the run
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+
+    seen = set()
+    while (items := await queue.get()) is not None:
+        for item in items:
+            seen.add(key(item))
+            yield item
+    for item in await asyncio.shield(task):
+        if key(item) not in seen:
+            yield item
@@ -0,0 +1,49 @@
+import xml.etree.ElementTree as ET
+from typing import Callable, List, Optional
+from app.models.hybrid_job import HybridJob
+
+class RSSItemParser:
+    """
+    Incremental RSS parser. Bytes are fed as they arrive; every completed
+    <item> is handed to handle_item and then dropped from the tree, so
+    memory stays around one item regardless of feed size.
+
+    Not thread-safe, but may be driven from a worker thread one call at a time.
+    """
+
+    def __init__(self, handle_item: Callable[[ET.Element], Optional[HybridJob]]):
+        self.handle_item = handle_item
+        self.jobs: List[HybridJob] = []
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack: List[ET.Element] = []
+
+    def feed(self, chunk: bytes) -> None:
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self) -> List[HybridJob]:
+        self._parser.close()
+        self._drain()
+        return self.jobs
+
+    def _drain(self) -> None:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._stack.append(elem)
+                continue
+
+            self._stack.pop()
+            if elem.tag != "item":
+                continue
+
+            try:
+                job = self.handle_item(elem)
+                if job is not None:
+                    self.jobs.append(job)
+            except Exception:
+                pass
+
+            # Free the item: clear its children and detach it from <channel>
+            elem.clear()
+            if self._stack:
+                self._stack[-1].remove(elem)
@@ -1,84 +1,81 @@
-import httpx
-from bs4 import BeautifulSoup
-from typing import List
+from typing import AsyncIterator, List, Optional
 from app.services.job_sources.normalize import normalize_job_data
+from app.services.job_sources.feed_cache import get_feed_snapshot, stream_feed_jobs, BufferedParser, FEED_TTL_MINUTES
+from app.services.job_sources.html_backends import get_hn_backend
+from app.services.job_sources.registry import register_source
 from app.models.hybrid_job import HybridJob
+from datetime import timedelta
 
-async def scrape_hn_jobs(query: str) -> List[HybridJob]:
-    url = "https://news.ycombinator.com/jobs"
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+PAGE_URL = "https://news.ycombinator.com/jobs"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
 
-    async with httpx.AsyncClient() as client:
+def parse_hn_page(content: str, backend: Optional[str] = None) -> List[HybridJob]:
+    """
+    Parse every job row of the HN /jobs page (no query filter).
+    backend overrides settings.HTML_PARSER_BACKEND (see html_backends).
+    """
+    extract_rows = get_hn_backend(backend)
+    jobs = []
+
+    for row_id, full_text, link in extract_rows(content):
         try:
-            print(f"Scraping HackerNews: {url}")
-            response = await client.get(url, headers=headers, timeout=15.0)
-            if response.status_code != 200:
-                print(f"HN returned status {response.status_code}")
-                return []
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            jobs = []
-            
-            # HN jobs are in <tr class="athing">
-            rows = soup.find_all("tr", class_="athing")
-            
-            for row in rows:
-                try:
-                    title_elem = row.find("span", class_="titleline")
-                    if not title_elem:
-                        continue
-                        
-                    a_tag = title_elem.find("a")
-                    if not a_tag:
-                        continue
-                        
-                    full_text = a_tag.get_text(strip=True)
-                    link = a_tag['href']
-                    
-                    # HN links can be relative or absolute
-                    if not link.startswith("http"):
-                        link = f"https://news.ycombinator.com/{link}"
-                        
-                    # Filter by query if provided (simple case-insensitive check)
-                    if query and query.lower() not in full_text.lower():
-                        continue
-                        
-                    # Extract Company and Title (Heuristic: "Company is hiring..." or "Company: Role")
-                    # HN titles are unstructured. We'll use the whole text as title and try to guess company.
-                    company = "HackerNews Job"
-                    title = full_text
-                    
-                    # Simple heuristic: Split by " is hiring " or ":"
-                    if " is hiring " in full_text:
-                        parts = full_text.split(" is hiring ")
-                        company = parts[0]
-                        title = parts[1] if len(parts) > 1 else full_text
-                    elif ":" in full_text:
-                         parts = full_text.split(":", 1)
-                         company = parts[0]
-                         title = parts[1]
-                    
-                    job_id = f"hn-{row.get('id')}"
-                    
-                    job = normalize_job_data(
-                        job_id=job_id,
-                        title=title,
-                        company=company,
-                        location="Remote", # HN jobs are often remote-friendly, but hard to tell without parsing text deep
-                        description=full_text,
-                        apply_link=link,
-                        source="hn",
-                        skills=[],
-                        raw_data={"raw_title": full_text}
-                    )
-                    jobs.append(job)
-                except Exception as e:
-                    continue
-            
-            return jobs
+            # HN links can be relative or absolute
+            if not link.startswith("http"):
+                link = f"https://news.ycombinator.com/{link}"
+
+            # Extract Company and Title (Heuristic: "Company is hiring..." or "Company: Role")
+            # HN titles are unstructured. We'll use the whole text as title and try to guess company.
+            company = "HackerNews Job"
+            title = full_text
+
+            # Simple heuristic: Split by " is hiring " or ":"
+            if " is hiring " in full_text:
+                parts = full_text.split(" is hiring ")
+                company = parts[0]
+                title = parts[1] if len(parts) > 1 else full_text
+            elif ":" in full_text:
+                 parts = full_text.split(":", 1)
+                 company = parts[0]
+                 title = parts[1]
+
+            job_id = f"hn-{row_id}"
+
+            job = normalize_job_data(
+                job_id=job_id,
+                title=title,
+                company=company,
+                location="Remote", # HN jobs are often remote-friendly, but hard to tell without parsing text deep
+                description=full_text,
+                apply_link=link,
+                source="hn",
+                skills=[],
+                raw_data={"raw_title": full_text}
+            )
+            jobs.append(job)
         except Exception as e:
-            print(f"Error scraping HN: {e}")
-            return []
+            continue
+
+    return jobs
+
+def new_hn_parser() -> BufferedParser:
+    # The page is small HTML, it is parsed once fully downloaded (in a worker thread)
+    return BufferedParser(parse_hn_page)
+
+async def scrape_hn_jobs(query: str) -> List[HybridJob]:
+    try:
+        snapshot = await get_feed_snapshot("hn", PAGE_URL, new_hn_parser, headers=HEADERS)
+
+        # Filter by query if provided (case-insensitive phrase match)
+        return snapshot.search(query, match_phrase=True)
+    except Exception as e:
+        print(f"Error scraping HN: {e}")
+        return []
+
+@register_source("hn", priority=3, query_specific=False, ttl=timedelta(minutes=FEED_TTL_MINUTES))
+async def stream_hn_jobs(query: str, location: str, remote: bool) -> AsyncIterator[HybridJob]:
+    # The HTML page is parsed whole, its jobs arrive together once downloaded
+    async for job in stream_feed_jobs("hn", PAGE_URL, new_hn_parser, query, match_phrase=True, headers=HEADERS):
+        yield job
@@ -1,98 +1,88 @@
 import re
-import httpx
 import xml.etree.ElementTree as ET
-from typing import List
-from app.services.job_sources.normalize import normalize_job_data
+from typing import AsyncIterator, List, Optional
+from app.services.job_sources.normalize import normalize_job_data, stable_hash
+from app.services.job_sources.feed_cache import get_feed_snapshot, stream_feed_jobs, FEED_TTL_MINUTES
+from app.services.job_sources.registry import register_source
+from app.services.job_sources.rss import RSSItemParser
 from app.models.hybrid_job import HybridJob
-from datetime import datetime
+from datetime import datetime, timedelta
 
-async def scrape_wwr(query: str) -> List[HybridJob]:
-    # Use RSS feed to avoid Cloudflare 403
-    url = "https://weworkremotely.com/remote-jobs.rss"
-    params = {"term": query}
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
+# Use RSS feed to avoid Cloudflare 403
+FEED_URL = "https://weworkremotely.com/remote-jobs.rss"
+
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+def parse_wwr_item(item: ET.Element) -> Optional[HybridJob]:
+    """
+    Normalize one RSS <item> of a WeWorkRemotely feed (no query filter).
+    """
+    title_elem = item.find("title")
+    link_elem = item.find("link")
+    desc_elem = item.find("description")
+    pub_date_elem = item.find("pubDate")
+
+    if title_elem is None or link_elem is None:
+        return None
+
+    full_title = title_elem.text
+    apply_link = link_elem.text
+    raw_description = desc_elem.text if desc_elem is not None else ""
+    # Clean description HTML using regex
+    description = HTML_TAG_PATTERN.sub('', raw_description or "").strip()
 
-    async with httpx.AsyncClient() as client:
+    # Title usually "Company: Role" or "Role: Company" or just "Role"
+    # WWR RSS title format: "Role: Company"
+    if ":" in full_title:
+        parts = full_title.split(":", 1)
+        title = parts[0].strip()
+        company = parts[1].strip()
+    else:
+        title = full_title
+        company = "WeWorkRemotely"
+
+    # Parse Date
+    published_at = None
+    if pub_date_elem is not None:
         try:
-            print(f"Fetching WeWorkRemotely RSS: {url} ? {params}")
-            response = await client.get(url, params=params, headers=headers, timeout=15.0)
-            if response.status_code != 200:
-                print(f"WWR RSS returned status {response.status_code}")
-                return []
-            
-            # Parse XML
-            try:
-                root = ET.fromstring(response.text)
-            except ET.ParseError:
-                # Try simple string parsing or BS4 if XML fails (sometimes encoding issues)
-                print("XML Parse Error")
-                return []
+            # RFC 822 format: "Wed, 02 Oct 2002 13:00:00 GMT"
+            published_at = datetime.strptime(pub_date_elem.text, "%a, %d %b %Y %H:%M:%S %z")
+        except:
+            pass
+
+    job_id = f"wwr-{apply_link.split('/')[-1]}" if apply_link else f"wwr-{stable_hash(full_title)}"
+
+    return normalize_job_data(
+        job_id=job_id,
+        title=title,
+        company=company,
+        location="Remote",
+        description=description,
+        apply_link=apply_link,
+        source="wwr",
+        published_at=published_at,
+        skills=[],
+        raw_data={"rss_title": full_title}
+    )
 
-            jobs = []
-            
-            # RSS structure: <rss><channel><item>...</item></channel></rss>
-            # Namespace might be present
-            
-            for item in root.findall(".//item"):
-                try:
-                    title_elem = item.find("title")
-                    link_elem = item.find("link")
-                    desc_elem = item.find("description")
-                    pub_date_elem = item.find("pubDate")
-                    
-                    if title_elem is None or link_elem is None:
-                        continue
-                        
-                    full_title = title_elem.text
-                    apply_link = link_elem.text
-                    raw_description = desc_elem.text if desc_elem is not None else ""
-                    # Clean description HTML using regex
-                    description = re.sub(r'<[^>]+>', '', raw_description).strip()
-                    
-                    # Title usually "Company: Role" or "Role: Company" or just "Role"
-                    # WWR RSS title format: "Role: Company"
-                    if ":" in full_title:
-                        parts = full_title.split(":", 1)
-                        title = parts[0].strip()
-                        company = parts[1].strip()
-                    else:
-                        title = full_title
-                        company = "WeWorkRemotely"
-                        
-                    # Parse Date
-                    published_at = None
-                    if pub_date_elem is not None:
-                        try:
-                            # RFC 822 format: "Wed, 02 Oct 2002 13:00:00 GMT"
-                            published_at = datetime.strptime(pub_date_elem.text, "%a, %d %b %Y %H:%M:%S %z")
-                        except:
-                            pass
-                            
-                    job_id = f"wwr-{apply_link.split('/')[-1]}" if apply_link else f"wwr-{hash(full_title)}"
-                    
-                    if query and query.lower() not in title.lower() and query.lower() not in description.lower():
-                        continue
+def new_wwr_parser() -> RSSItemParser:
+    return RSSItemParser(parse_wwr_item)
+
+async def scrape_wwr(query: str) -> List[HybridJob]:
+    try:
+        print(f"Fetching WeWorkRemotely RSS: {FEED_URL} ? term={query}")
+        snapshot = await get_feed_snapshot("wwr", FEED_URL, new_wwr_parser, headers=HEADERS, params={"term": query})
+        return snapshot.search(query, match_phrase=True)
+    except Exception as e:
+        print(f"Error fetching WWR RSS: {e}")
+        return []
 
-                    job = normalize_job_data(
-                        job_id=job_id,
-                        title=title,
-                        company=company,
-                        location="Remote",
-                        description=description,
-                        apply_link=apply_link,
-                        source="wwr",
-                        published_at=published_at,
-                        skills=[],
-                        raw_data={"rss_title": full_title}
-                    )
-                    jobs.append(job)
-                except Exception as e:
-                    continue
-                    
-            return jobs
-        except Exception as e:
-            print(f"Error fetching WWR RSS: {e}")
-            return []
+@register_source("wwr", priority=1, ttl=timedelta(minutes=FEED_TTL_MINUTES))
+async def stream_wwr(query: str, location: str, remote: bool) -> AsyncIterator[HybridJob]:
+    # Jobs are yielded as the parser closes each <item>
+    async for job in stream_feed_jobs("wwr", FEED_URL, new_wwr_parser, query, match_phrase=True, headers=HEADERS, params={"term": query}):
+        yield job
@@ -13,6 +13,11 @@ except OSError:
     print("Warning: en_core_web_sm not found. Parsing will be limited.")
     nlp = None
 
+# Bump whenever parse_resume_text changes in a way that should be reflected
+# in previously saved resumes (new skills, better section detection, ...).
+# Stored resumes with an older version are picked up by resume_reparser.
+PARSER_VERSION = 1
+
 def extract_text_from_pdf(file_path: str) -> str:
     text = ""
     with pdfplumber.open(file_path) as pdf:
@@ -39,6 +44,15 @@ def parse_resume_text(text: str) -> dict:
         "certifications": []
     }
 
+    data.update(extract_contact_details(text))
+    data["skills"] = extract_skills(text)
+    data.update(extract_sections(text))
+
+    return data
+
+def extract_contact_details(text: str) -> dict:
+    data = {"name": "", "email": "", "phone": "", "location": ""}
+
     # Basic Regex Extraction
     email_pattern = r"[\w\.-]+@[\w\.-]+"
     phone_pattern = r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}"
@@ -83,6 +97,9 @@ def parse_resume_text(text: str) -> dict:
         if loc_match:
             data["location"] = loc_match.group(0)
 
+    return data
+
+def extract_skills(text: str) -> list:
     # Expanded Skills Extraction
     common_skills = [
         # Languages
@@ -116,8 +133,16 @@ def parse_resume_text(text: str) -> dict:
         
         if re.search(pattern, text_lower):
             found_skills.add(skill.title())
-            
-    data["skills"] = list(found_skills)
+
+    # Sorted: set order depends on the hash seed, and saved skills are
+    # compared with a later parse (resume_reparser.user_overrides)
+    return sorted(found_skills)
+
+def extract_sections(text: str) -> dict:
+    """
+    Cheap, regex-only stage (no spaCy). Safe to re-run in bulk on stored text.
+    """
+    data = {"experience": [], "education": [], "certifications": []}
 
     # Section Extraction (Simple)
     lines = text.split('\n')
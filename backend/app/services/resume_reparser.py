@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime
+from app.database import database
+from app.services.resume_parser import PARSER_VERSION, extract_skills, extract_sections
+
+RESUME_COLLECTION = "resumes"
+# Fields the cheap parse stages derive from raw_text. Those the user
+# changed on /save are listed in user_overrides and never re-parsed.
+REPARSED_FIELDS = ("skills", "experience", "education", "certifications")
+BATCH_SIZE = 100
+MAX_CONCURRENCY = 4
+
+def derive_fields(text: str) -> dict:
+    """
+    REPARSED_FIELDS as the current parser reads them from text.
+    """
+    data = {"skills": extract_skills(text)}
+    data.update(extract_sections(text))
+    return {field: data.get(field, []) for field in REPARSED_FIELDS}
+
+# Compared as sets: their order carries no meaning
+UNORDERED_FIELDS = {"skills"}
+
+def user_overrides(resume: dict, derived: dict) -> list:
+    # Fields whose saved value is not what the parser produced
+    overrides = []
+    for field in REPARSED_FIELDS:
+        saved, parsed = resume.get(field), derived[field]
+        if field in UNORDERED_FIELDS and saved is not None:
+            saved, parsed = set(saved), set(parsed)
+        if saved != parsed:
+            overrides.append(field)
+    return overrides
+
+async def reparse_resume(resume: dict) -> None:
+    """
+    Re-run the cheap parse stages (skills + sections) on the stored raw text
+    and refresh the derived fields the user has not edited. Contact details
+    (spaCy) and the original file are left alone.
+    """
+    # Regex work is CPU bound, keep it off the event loop
+    parsed = await asyncio.to_thread(derive_fields, resume["raw_text"])
+    overrides = set(resume.get("user_overrides", []))
+    derived = {field: value for field, value in parsed.items() if field not in overrides}
+    derived["parser_version"] = PARSER_VERSION
+    derived["reparsed_at"] = datetime.utcnow()
+
+    await database.get_collection(RESUME_COLLECTION).update_one(
+        {"_id": resume["_id"], "parser_version": resume.get("parser_version")},
+        {"$set": derived}
+    )
+
+async def reparse_stale_resumes(batch_size: int = BATCH_SIZE, concurrency: int = MAX_CONCURRENCY) -> int:
+    """
+    Stream over resumes parsed by an older parser version and re-parse them
+    in chunks with bounded concurrency. Returns the number of updated resumes.
+    """
+    collection = database.get_collection(RESUME_COLLECTION)
+    query = {
+        "raw_text": {"$exists": True},
+        "$or": [
+            {"parser_version": {"$lt": PARSER_VERSION}},
+            {"parser_version": {"$exists": False}}
+        ]
+    }
+    projection = {"raw_text": 1, "parser_version": 1, "user_overrides": 1}
+
+    semaphore = asyncio.Semaphore(concurrency)
+    updated = 0
+
+    async def _worker(resume: dict):
+        async with semaphore:
+            try:
+                await reparse_resume(resume)
+                return True
+            except Exception as e:
+                print(f"Error re-parsing resume {resume['_id']}: {e}")
+                return False
+
+    cursor = collection.find(query, projection).batch_size(batch_size)
+    batch = []
+    async for resume in cursor:
+        batch.append(resume)
+        if len(batch) >= batch_size:
+            results = await asyncio.gather(*[_worker(r) for r in batch])
+            updated += sum(results)
+            batch = []
+
+    if batch:
+        results = await asyncio.gather(*[_worker(r) for r in batch])
+        updated += sum(results)
+
+    if updated:
+        print(f"Re-parsed {updated} resumes to parser version {PARSER_VERSION}")
+    return updated
+
+if __name__ == "__main__":
+    # Run as a standalone batch job: python -m app.services.resume_reparser
+    asyncio.run(reparse_stale_resumes())
@@ -0,0 +1,29 @@
+# Abbreviations and spelling variants of job search terms, folded to one
+# form. Shared by query canonicalization (query_normalizer) and near
+# duplicate detection (minhash) so both read "Sr. Dev" the same way.
+ABBREVIATIONS = {
+    "dev": "developer",
+    "devs": "developer",
+    "developers": "developer",
+    "engineers": "engineer",
+    "eng": "engineer",
+    "engr": "engineer",
+    "sr": "senior",
+    "snr": "senior",
+    "jr": "junior",
+    "mgr": "manager",
+    "mgmt": "management",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "js": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "golang": "go",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "fullstack": "full stack",
+    "frontend": "front end",
+    "backend": "back end",
+    "devops": "dev ops",
+    "qa": "quality assurance",
+}
@@ -0,0 +1,124 @@
+import re
+import zlib
+from typing import Dict, Iterable, List, Set
+import numpy as np
+from app.utils.abbreviations import ABBREVIATIONS
+from app.utils.token_index import tokenize
+
+# 16 bands x 4 rows: pairs above ~0.5 Jaccard usually share a band,
+# candidates are then verified against NEAR_DUPLICATE_THRESHOLD
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.7
+# Shared description templates must not merge different roles: the title
+# and company words have to overlap this much as well
+HEAD_THRESHOLD = 0.5
+# Long descriptions differ mostly in boilerplate; the opening is enough
+MAX_DESCRIPTION_TOKENS = 150
+
+# Fixed seed: signatures are persisted and compared across processes
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(41)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+def normalize_tokens(text: str) -> List[str]:
+    """
+    Lowercase word tokens with HTML removed and common job title
+    abbreviations expanded ("Sr. Dev" -> senior developer).
+    """
+    tokens = []
+    for token in tokenize(HTML_TAG_PATTERN.sub(" ", text or "")):
+        tokens.extend(ABBREVIATIONS.get(token, token).split())
+    return tokens
+
+def job_shingles(tokens: List[str]) -> Set[int]:
+    """
+    Hashed word shingles; short token lists still produce one shingle.
+    """
+    shingles = set()
+    for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1)):
+        shingles.add(" ".join(tokens[i:i + SHINGLE_SIZE]))
+    # crc32 is stable across processes, unlike hash()
+    return {zlib.crc32(shingle.encode()) for shingle in shingles}
+
+def signature(shingles: Iterable[int]) -> List[int]:
+    # Shingle hashes are 32-bit (crc32): with a and b below 2^32 too,
+    # a * x + b stays below 2^64 and the uint64 arithmetic cannot wrap
+    values = np.fromiter((shingle & 0xFFFFFFFF for shingle in shingles), dtype=np.uint64)
+    if values.size == 0:
+        return [0] * NUM_PERM
+    # One universal hash per permutation, minimum over all shingles
+    hashed = (np.outer(values, _PERM_A) + _PERM_B) % _MERSENNE_PRIME
+    return hashed.min(axis=0).tolist()
+
+def band_keys(sig: List[int]) -> List[str]:
+    keys = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS:(band + 1) * ROWS]
+        keys.append(f"{band}:{zlib.crc32(','.join(map(str, rows)).encode()):08x}")
+    return keys
+
+def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """
+    Estimated Jaccard similarity of the two shingle sets.
+    """
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+class JobSketch:
+    """
+    What near-duplicate checks need from a job: a MinHash signature over
+    title, company and the start of the description, plus the normalized
+    title and company words.
+    """
+
+    def __init__(self, signature: List[int], head: Iterable[str]):
+        self.signature = signature
+        self.head = set(head)
+
+    @classmethod
+    def from_job(cls, title: str, company: str, description: str) -> "JobSketch":
+        head = normalize_tokens(title) + normalize_tokens(company)
+        tokens = head + normalize_tokens(description)[:MAX_DESCRIPTION_TOKENS]
+        return cls(signature(job_shingles(tokens)), head)
+
+    def is_near_duplicate(self, other: "JobSketch") -> bool:
+        return (
+            similarity(self.signature, other.signature) >= NEAR_DUPLICATE_THRESHOLD
+            and jaccard(self.head, other.head) >= HEAD_THRESHOLD
+        )
+
+class LSHIndex:
+    """
+    In-memory banded index: near_duplicates() only compares against keys
+    sharing at least one band, so lookups stay roughly constant per item.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[str, Set] = {}
+        self.sketches: Dict = {}
+
+    def add(self, key, sketch: JobSketch) -> None:
+        self.sketches[key] = sketch
+        for band in band_keys(sketch.signature):
+            self.buckets.setdefault(band, set()).add(key)
+
+    def remove(self, key) -> None:
+        sketch = self.sketches.pop(key, None)
+        if sketch is None:
+            return
+        for band in band_keys(sketch.signature):
+            self.buckets.get(band, set()).discard(key)
+
+    def near_duplicates(self, sketch: JobSketch) -> List:
+        candidates = set()
+        for band in band_keys(sketch.signature):
+            candidates |= self.buckets.get(band, set())
+        return [key for key in candidates if sketch.is_near_duplicate(self.sketches[key])]
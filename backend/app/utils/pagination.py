@@ -0,0 +1,55 @@
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Tuple
+from bson import json_util
+
+# (field, direction) pairs; the last field must be unique (usually _id)
+SortSpec = List[Tuple[str, int]]
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    Opaque token for the seek values of the last item on a page.
+    bson's extended JSON keeps datetimes and ObjectIds intact.
+    """
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode().rstrip("=")
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """
+    Inverse of encode_cursor. Raises ValueError for malformed tokens.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+    return values
+
+def cursor_for(doc: dict, sort: SortSpec, **extra: Any) -> str:
+    return encode_cursor({**{field: doc[field] for field, _ in sort}, **extra})
+
+def seek_filter(sort: SortSpec, after: Dict[str, Any]) -> dict:
+    """
+    Filter for the items after `after` in sort order, e.g. for
+    [("updated_at", -1), ("_id", -1)]:
+    {"$or": [{"updated_at": {"$lt": u}}, {"updated_at": u, "_id": {"$lt": i}}]}
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev: after[prev] for prev, _ in sort[:i]}
+        clause[field] = {"$gt" if direction > 0 else "$lt": after[field]}
+        clauses.append(clause)
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+def page_meta(next_cursor: Optional[str], total: Optional[int] = None, page: Optional[int] = None, limit: Optional[int] = None) -> dict:
+    meta: Dict[str, Any] = {"next_cursor": next_cursor}
+    if page is not None:
+        meta["page"] = page
+    if limit is not None:
+        meta["limit"] = limit
+    if total is not None:
+        meta["total"] = total
+        if limit:
+            meta["total_pages"] = (total + limit - 1) // limit
+    return meta
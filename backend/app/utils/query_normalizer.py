@@ -0,0 +1,106 @@
+import re
+from typing import Dict, List, Set
+from app.core import metrics
+from app.utils.abbreviations import ABBREVIATIONS
+from app.utils.token_index import tokenize
+
+# Words that do not change what a job search returns
+STOPWORDS = {
+    "a", "an", "and", "the", "for", "in", "of", "at", "to", "with", "on", "or",
+    "job", "jobs", "position", "positions", "role", "roles", "opening", "openings",
+}
+
+# Whole-location aliases, matched after punctuation folding
+LOCATION_ALIASES = {
+    "us": "united states",
+    "usa": "united states",
+    "united states of america": "united states",
+    "uk": "united kingdom",
+    "great britain": "united kingdom",
+    "gb": "united kingdom",
+    "nyc": "new york",
+    "new york city": "new york",
+    "new york ny": "new york",
+    "sf": "san francisco",
+    "san francisco ca": "san francisco",
+    "bay area": "san francisco",
+    "anywhere": "remote",
+    "worldwide": "remote",
+    "global": "remote",
+}
+
+LOCATION_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Distinct raw keys tracked for the collapse ratio; bounded per process
+MAX_TRACKED_KEYS = 10000
+_raw_keys: Set[str] = set()
+_canonical_keys: Set[str] = set()
+
+def expand_tokens(text: str) -> List[str]:
+    """
+    Lowercase tokens with abbreviations expanded, in order. Job text indexed
+    with these matches query_tokens ("Sr. Dev" finds "senior developer").
+    """
+    tokens = []
+    for token in tokenize(text):
+        tokens.extend(ABBREVIATIONS.get(token, token).split())
+    return tokens
+
+def query_tokens(query: str) -> List[str]:
+    """
+    Canonical tokens of a search query: lowercase, punctuation folded,
+    abbreviations expanded, stopwords removed, sorted and deduplicated.
+    A query made only of stopwords keeps them, so it never becomes empty.
+    """
+    tokens = expand_tokens(query)
+    kept = [token for token in tokens if token not in STOPWORDS]
+    return sorted(set(kept or tokens))
+
+def normalize_query(query: str) -> str:
+    return " ".join(query_tokens(query))
+
+def normalize_location(location: str) -> str:
+    """
+    "New York, NY", "NYC" and "new york city" all become "new york".
+    Word order is kept: it matters for places.
+    """
+    folded = " ".join(LOCATION_PATTERN.findall((location or "").lower()))
+    return LOCATION_ALIASES.get(folded, folded)
+
+def canonical_key(query: str, location: str = "", remote: bool = False) -> str:
+    """
+    Cache key shared by every spelling of the same search, e.g.
+    "Python Dev" and "developer, python" in "NYC".
+    """
+    return f"{normalize_query(query)}_{normalize_location(location)}_{remote}"
+
+def raw_key(query: str, location: str = "", remote: bool = False) -> str:
+    # The key caches used before canonicalization, for the collapse ratio
+    return f"{(query or '').lower()}_{(location or '').lower()}_{remote}"
+
+def record_key(query: str, location: str, remote: bool, key: str) -> None:
+    """
+    Track how many raw query spellings map to each canonical key and
+    publish the ratio as query_keys.* gauges.
+    """
+    if len(_raw_keys) < MAX_TRACKED_KEYS:
+        _raw_keys.add(raw_key(query, location, remote))
+        _canonical_keys.add(key)
+    metrics.set_gauge("query_keys.raw", len(_raw_keys))
+    metrics.set_gauge("query_keys.canonical", len(_canonical_keys))
+    metrics.set_gauge("query_keys.collapse_ratio", round(collapse_ratio(_raw_keys, _canonical_keys), 3))
+
+def collapse_ratio(raw: Set[str], canonical: Set[str]) -> float:
+    """
+    Distinct raw keys per canonical key; 1.0 means nothing collapsed.
+    """
+    return len(raw) / len(canonical) if canonical else 1.0
+
+def collapse_report(searches: List[tuple]) -> Dict[str, float]:
+    """
+    Collapse ratio of (query, location, remote) tuples, e.g. from a
+    search log, without touching the process-wide gauges.
+    """
+    raw = {raw_key(*search) for search in searches}
+    canonical = {canonical_key(*search) for search in searches}
+    return {"raw": len(raw), "canonical": len(canonical), "collapse_ratio": round(collapse_ratio(raw, canonical), 3)}
@@ -0,0 +1,71 @@
+import asyncio
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict
+from pymongo.errors import DuplicateKeyError
+from app.core import metrics
+
+# Identifies this process as the owner of a lease document
+WORKER_ID = f"{socket.gethostname()}-{os.getpid()}"
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key: the first caller runs the
+    function, everyone arriving while it is in flight awaits the same result.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+
+    def is_running(self, key: str) -> bool:
+        return key in self._calls
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+            metrics.increment(f"single_flight.coalesced.{self.name}")
+            # shield: a cancelled waiter must not cancel the shared call
+            return await asyncio.shield(task)
+
+        task = asyncio.create_task(func())
+        self._calls[key] = task
+        self._waiters[key] = 0
+        metrics.increment(f"single_flight.calls.{self.name}")
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._finish(key)
+            else:
+                # The leader was cancelled, clean up once the call completes
+                task.add_done_callback(lambda _: self._finish(key))
+
+    def _finish(self, key: str) -> None:
+        self._calls.pop(key, None)
+        waiters = self._waiters.pop(key, 0)
+        if waiters:
+            print(f"single-flight {self.name}: {waiters} waiters coalesced on {key}")
+
+async def acquire_lease(collection, key: str, ttl_seconds: float) -> bool:
+    """
+    Try to take a cross-process lease stored as a document with _id=key.
+    Succeeds if there is no lease or the existing one has expired.
+    """
+    now = datetime.utcnow()
+    try:
+        await collection.update_one(
+            {"_id": key, "expires_at": {"$lt": now}},
+            {"$set": {"owner": WORKER_ID, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        # A live lease exists, the upsert's insert collided with it
+        return False
+
+async def release_lease(collection, key: str) -> None:
+    await collection.delete_one({"_id": key, "owner": WORKER_ID})
@@ -0,0 +1,104 @@
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+STREAM_FORMATS = "^(sse|ndjson)$"
+EXPORT_FORMATS = "^(ndjson|json)$"
+
+MEDIA_TYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+# Documents per Mongo batch and per written chunk of an export
+EXPORT_BATCH_SIZE = 200
+
+def format_event(event: str, data: Any, fmt: str = "sse") -> str:
+    data = jsonable_encoder(data)
+    if fmt == "ndjson":
+        return json.dumps({"event": event, "data": data}) + "\n"
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def event_stream_response(events: AsyncIterator[Tuple[str, Any]], fmt: str = "sse") -> StreamingResponse:
+    """
+    Wrap an async iterator of (event, data) pairs as Server-Sent Events or
+    newline-delimited JSON ({"event": ..., "data": ...} per line).
+    """
+    async def body():
+        async for event, data in events:
+            yield format_event(event, data, fmt)
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        # Proxies must not buffer the stream or clients see nothing until the end
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[Dict[str, int]]:
+    """
+    Mongo projection from a comma separated field list ("title,company").
+    None when no fields are given. Raises ValueError for unknown fields.
+    """
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in set(allowed)]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return {name: 1 for name in names}
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+async def _export_chunks(cursor, fmt: str, transform: Optional[Callable[[dict], dict]], batch_size: int) -> AsyncIterator[str]:
+    lines = []
+    first = True
+    if fmt == "json":
+        yield "["
+    async for doc in cursor:
+        line = json.dumps(transform(doc) if transform else doc, default=_json_default)
+        if fmt == "json" and not first:
+            line = "," + line
+        first = False
+        lines.append(line)
+        if len(lines) >= batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+    if fmt == "json":
+        yield "]"
+
+def export_response(
+    cursor,
+    fmt: str = "ndjson",
+    transform: Optional[Callable[[dict], dict]] = None,
+    filename: Optional[str] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> StreamingResponse:
+    """
+    Stream a Motor cursor as NDJSON (one document per line) or as one JSON
+    array written in chunks. Documents are read a batch at a time and the
+    next batch is only fetched once the previous chunk has been sent, so
+    memory stays flat however large the result is.
+    """
+    headers = {"X-Accel-Buffering": "no"}
+    if filename:
+        extension = "ndjson" if fmt == "ndjson" else "json"
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+    return StreamingResponse(
+        _export_chunks(cursor.batch_size(batch_size), fmt, transform, batch_size),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers
+    )
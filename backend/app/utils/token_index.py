@@ -0,0 +1,40 @@
+import re
+from typing import Dict, Iterable, List, Set
+
+# Keep "+" and "#" so "c++" and "c#" stay distinct tokens
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+class TokenIndex:
+    """
+    Inverted index from token to document positions, used to filter a
+    prebuilt job list by query without rescanning every document.
+    """
+
+    def __init__(self, texts: Iterable[str]):
+        self.postings: Dict[str, Set[int]] = {}
+        self.size = 0
+        for position, text in enumerate(texts):
+            for token in set(tokenize(text)):
+                self.postings.setdefault(token, set()).add(position)
+            self.size = position + 1
+
+    def match_all(self, tokens: Iterable[str]) -> List[int]:
+        """
+        Positions of documents containing every token, in original order.
+        No tokens matches everything.
+        """
+        tokens = set(tokens)
+        if not tokens:
+            return list(range(self.size))
+
+        # Intersect starting from the rarest token
+        postings = sorted((self.postings.get(t, set()) for t in tokens), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return sorted(result)
@@ -0,0 +1,145 @@
+"""
+Hybrid cache-hit read path benchmark.
+
+Builds a seeded page of cached job documents (as load_jobs reads them
+from the jobs store) and measures, per page, the previous read path
+(HybridJob(**doc) validation, then jsonable_encoder + json.dumps as
+FastAPI does for a plain dict response) against the current one
+(job_from_cache + HybridJobResponse.model_dump_json). Reports p50/p99
+latency and peak allocation, and checks both produce the same JSON.
+Runs offline.
+
+Usage:
+    python bench_cache_read.py                    # 50 jobs per page, 300 rounds
+    python bench_cache_read.py --jobs 20 --rounds 1000 --seed 7
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+from app.models.hybrid_job import HybridJob, HybridJobResponse, job_from_cache
+from app.services.job_sources.search_links import generate_search_links
+
+ROLES = ["Software Engineer", "Backend Developer", "Data Engineer", "Full Stack Developer", "DevOps Engineer"]
+COMPANIES = ["Tech Corp", "Acme Inc", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries"]
+LOCATIONS = ["Remote", "New York, NY", "Berlin, DE", "London, UK", "Toronto, ON"]
+SKILLS = ["Python", "JavaScript", "React", "Docker", "AWS", "PostgreSQL", "MongoDB", "Go", "Kubernetes"]
+SOURCES = ["api", "wwr", "remoteok", "hn"]
+
+def make_docs(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+    docs = []
+    for i in range(count):
+        role = rng.choice(ROLES)
+        company = rng.choice(COMPANIES)
+        skills = rng.sample(SKILLS, 4)
+        description = " ".join(
+            f"We are looking for a {role} with {skill} experience to join {company}."
+            for skill in skills
+        ) * 6
+        # Same shape as a jobs store document after load_jobs' projection
+        docs.append(HybridJob(
+            job_id=f"job-{seed}-{i}",
+            title=role,
+            company=company,
+            location=rng.choice(LOCATIONS),
+            description=description,
+            apply_link=f"https://example.com/jobs/{seed}/{i}",
+            source=rng.choice(SOURCES),
+            published_at=now - timedelta(hours=rng.randint(1, 500)),
+            skills=skills,
+            fetched_at=now
+        ).dict(exclude={"raw_data"}))
+    return docs
+
+def old_path(docs: list, links: dict) -> bytes:
+    jobs = [HybridJob(**doc) for doc in docs]
+    body = {
+        "jobs": jobs,
+        "external_search_links": links,
+        "sources_used": SOURCES,
+        "total": len(jobs),
+        "partial": False,
+        "missing_sources": []
+    }
+    return json.dumps(jsonable_encoder(body)).encode()
+
+def new_path(docs: list, links: dict) -> bytes:
+    response = HybridJobResponse.model_construct(
+        jobs=[job_from_cache(doc) for doc in docs],
+        external_search_links=links,
+        sources_used=SOURCES,
+        total=len(docs),
+        partial=False,
+        missing_sources=[]
+    )
+    return response.model_dump_json().encode()
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def measure(read, docs: list, links: dict, rounds: int) -> dict:
+    latencies = []
+    for _ in range(rounds):
+        # Each round reads fresh dicts, as a Mongo cursor would return
+        page = [dict(doc) for doc in docs]
+        t0 = time.perf_counter()
+        read(page, links)
+        latencies.append(time.perf_counter() - t0)
+
+    page = [dict(doc) for doc in docs]
+    tracemalloc.start()
+    read(page, links)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Hybrid cache-hit read path benchmark")
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    docs = make_docs(args.jobs, args.seed)
+    links = generate_search_links("software engineer", "remote")
+
+    if json.loads(old_path(docs, links)) != json.loads(new_path(docs, links)):
+        print("OUTPUT MISMATCH: fast path serializes differently")
+        sys.exit(1)
+
+    results = {
+        "validate": measure(old_path, docs, links, args.rounds),
+        "construct": measure(new_path, docs, links, args.rounds),
+    }
+
+    print(f"Page of {args.jobs} cached jobs, {args.rounds} rounds")
+    print(f"{'path':10} {'p50 ms':>10} {'p99 ms':>10} {'peak KB':>10}")
+    for name, m in results.items():
+        print(f"{name:10} {m['p50_ms']:>10} {m['p99_ms']:>10} {m['peak_kb']:>10}")
+
+    old, new = results["validate"], results["construct"]
+    speedup = round(old["p50_ms"] / new["p50_ms"], 2) if new["p50_ms"] else 0.0
+    print(f"p50 speedup: {speedup}x, peak allocation {new['peak_kb']} KB vs {old['peak_kb']} KB")
+    print("SUCCESS: Both paths produce identical JSON.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+HN jobs page parser benchmark.
+
+Parses the saved HN /jobs page fixtures in fixtures/ with every installed
+HTML backend, reports pages/sec and p50/p99 latency per backend plus the
+speedup over the bs4 fallback, and checks that every backend produces the
+same jobs. Runs offline.
+
+Usage:
+    python bench_hn_parser.py                 # 200 rounds over all fixtures
+    python bench_hn_parser.py --rounds 50
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.job_sources.html_backends import HN_BACKENDS
+from app.services.job_sources.scrape_hn_jobs import parse_hn_page
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def load_fixtures() -> dict:
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "hn_*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def comparable(jobs: list) -> list:
+    # fetched_at is stamped at parse time and always differs
+    return [job.dict(exclude={"fetched_at"}) for job in jobs]
+
+def check_identical(pages: dict) -> list:
+    mismatches = []
+    for name, content in pages.items():
+        expected = comparable(parse_hn_page(content, backend="bs4"))
+        if not expected:
+            mismatches.append(f"{name}: bs4 found no jobs")
+        for backend in HN_BACKENDS:
+            if comparable(parse_hn_page(content, backend=backend)) != expected:
+                mismatches.append(f"{name}: {backend} output differs from bs4")
+    return mismatches
+
+def measure(backend: str, pages: dict, rounds: int) -> dict:
+    contents = list(pages.values())
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for content in contents:
+            t0 = time.perf_counter()
+            parse_hn_page(content, backend=backend)
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "pages_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="HN jobs page parser benchmark")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    pages = load_fixtures()
+    if not pages:
+        print(f"No fixtures found in {FIXTURE_DIR}")
+        sys.exit(1)
+    print(f"Fixtures: {', '.join(pages)}")
+
+    results = {backend: measure(backend, pages, args.rounds) for backend in HN_BACKENDS}
+    base = results["bs4"]["pages_per_sec"]
+
+    print(f"{'backend':10} {'pages/sec':>10} {'p50 ms':>10} {'p99 ms':>10} {'speedup':>10}")
+    for backend, m in results.items():
+        speedup = round(m["pages_per_sec"] / base, 2) if base else 0.0
+        print(f"{backend:10} {m['pages_per_sec']:>10} {m['p50_ms']:>10} {m['p99_ms']:>10} {speedup:>9}x")
+
+    mismatches = check_identical(pages)
+    if mismatches:
+        print("OUTPUT MISMATCH:")
+        for m in mismatches:
+            print(f"  {m}")
+        sys.exit(1)
+    print("SUCCESS: All backends produce identical jobs.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Resume parser throughput benchmark.
+
+Generates a seeded corpus of PDF and DOCX resumes offline, then measures
+docs/sec, p50/p99 latency and peak allocation per document for
+extract_text_from_pdf, extract_text_from_docx and parse_resume_text
+(with and without spaCy). Results are compared against a stored baseline.
+
+Usage:
+    python bench_parser.py                      # run and compare
+    python bench_parser.py --update-baseline    # run and store as baseline
+    python bench_parser.py --docs 20 --seed 7   # smaller / different corpus
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the current directory to sys.path so we can import app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import docx
+from app.services import resume_parser
+from app.services.resume_parser import extract_text_from_pdf, extract_text_from_docx, parse_resume_text
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_parser_baseline.json")
+
+# A regression is reported when a metric is worse than baseline by more than this
+SPEED_TOLERANCE = 0.25
+LATENCY_TOLERANCE = 0.5  # p99 over a small corpus is noisy
+MEMORY_TOLERANCE = 0.25
+
+FIRST_NAMES = ["John", "Priya", "Wei", "Maria", "Ahmed", "Sofia", "Liam", "Aisha", "Kenji", "Elena"]
+LAST_NAMES = ["Doe", "Sharma", "Chen", "Garcia", "Khan", "Rossi", "Murphy", "Okafor", "Tanaka", "Petrova"]
+CITIES = ["New York, NY", "Austin, TX", "London, UK", "Berlin, DE", "Toronto, ON", "Bangalore, KA"]
+SKILLS = ["Python", "JavaScript", "TypeScript", "React", "Node.js", "Django", "FastAPI", "Docker",
+          "Kubernetes", "AWS", "PostgreSQL", "MongoDB", "Redis", "Git", "Terraform", "Pandas", "C++", "Go"]
+ROLES = ["Software Engineer", "Backend Developer", "Data Engineer", "Full Stack Developer", "DevOps Engineer"]
+COMPANIES = ["Tech Corp", "Acme Inc", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries"]
+BULLETS = [
+    "Built scalable APIs using {a} and {b} serving thousands of requests per minute.",
+    "Migrated legacy services to {a}, reducing deployment time by {n}%.",
+    "Designed data pipelines with {a} and {b} processing millions of records daily.",
+    "Led a team of {n} engineers delivering features across {a} and {b}.",
+    "Improved test coverage to {n}% and introduced CI with {a}.",
+]
+
+def generate_resume_lines(rng: random.Random, num_jobs: int) -> list:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        rng.choice(CITIES),
+        f"{name.lower().replace(' ', '.')}@example.com",
+        f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        "",
+        "Summary",
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience.",
+        "",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, rng.randint(4, 10))),
+        "",
+        "Experience",
+    ]
+    year = 2024
+    for _ in range(num_jobs):
+        start = year - rng.randint(1, 4)
+        lines.append(rng.choice(ROLES))
+        lines.append(f"{rng.choice(COMPANIES)} - {rng.choice(CITIES)}")
+        lines.append(f"Jan {start} - Dec {year}")
+        for _ in range(rng.randint(2, 5)):
+            a, b = rng.sample(SKILLS, 2)
+            lines.append("- " + rng.choice(BULLETS).format(a=a, b=b, n=rng.randint(2, 90)))
+        year = start
+    lines += [
+        "",
+        "Education",
+        "B.S. Computer Science",
+        f"University of Technology {year - 4} - {year}",
+        "",
+        "Certifications",
+        "AWS Certified Developer",
+    ]
+    return lines
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def write_pdf(path: str, lines: list):
+    """
+    Minimal text-only PDF writer (Helvetica, 50 lines per page), so the
+    benchmark needs nothing beyond the parser's own dependencies.
+    """
+    pages = [lines[i:i + 50] for i in range(0, len(lines), 50)] or [[]]
+    objects = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog_id = add(b"")
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for page_lines in pages:
+        content = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in page_lines:
+            content.append(f"({_pdf_escape(line)}) Tj T*")
+        content.append("ET")
+        stream = "\n".join(content).encode("latin-1", "replace")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref_at)
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+
+def write_docx(path: str, lines: list):
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+def generate_corpus(directory: str, num_docs: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    corpus = {"pdf": [], "docx": []}
+    for i in range(num_docs):
+        # Varying lengths: 1 to 12 previous jobs
+        lines = generate_resume_lines(rng, rng.randint(1, 12))
+        pdf_path = os.path.join(directory, f"resume_{i}.pdf")
+        docx_path = os.path.join(directory, f"resume_{i}.docx")
+        write_pdf(pdf_path, lines)
+        write_docx(docx_path, lines)
+        corpus["pdf"].append(pdf_path)
+        corpus["docx"].append(docx_path)
+    return corpus
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def measure(func, inputs: list) -> dict:
+    # Timing pass (no tracemalloc overhead)
+    latencies = []
+    started = time.perf_counter()
+    for item in inputs:
+        t0 = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    # Memory pass: peak Python allocation while handling a single document
+    peaks = []
+    for item in inputs:
+        tracemalloc.start()
+        func(item)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        "docs_per_sec": round(len(inputs) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_kb_per_doc": round(max(peaks) / 1024, 1),
+    }
+
+def run_benchmarks(num_docs: int, seed: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = generate_corpus(tmp, num_docs, seed)
+
+        results["extract_text_from_pdf"] = measure(extract_text_from_pdf, corpus["pdf"])
+        results["extract_text_from_docx"] = measure(extract_text_from_docx, corpus["docx"])
+
+        texts = [extract_text_from_docx(path) for path in corpus["docx"]]
+
+        nlp = resume_parser.nlp
+        resume_parser.nlp = None
+        try:
+            results["parse_resume_text[no_spacy]"] = measure(parse_resume_text, texts)
+        finally:
+            resume_parser.nlp = nlp
+
+        if nlp is not None:
+            results["parse_resume_text[spacy]"] = measure(parse_resume_text, texts)
+        else:
+            print("spaCy model not available, skipping parse_resume_text[spacy]")
+
+    results["_meta"] = {
+        "docs": num_docs,
+        "seed": seed,
+        # ru_maxrss is KiB on Linux
+        "process_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+    return results
+
+def compare(results: dict, baseline: dict) -> list:
+    regressions = []
+    for name, metrics in results.items():
+        if name.startswith("_") or name not in baseline:
+            continue
+        base = baseline[name]
+        if metrics["docs_per_sec"] < base["docs_per_sec"] * (1 - SPEED_TOLERANCE):
+            regressions.append(f"{name}: docs/sec {metrics['docs_per_sec']} < baseline {base['docs_per_sec']}")
+        if metrics["p99_ms"] > base["p99_ms"] * (1 + LATENCY_TOLERANCE):
+            regressions.append(f"{name}: p99 {metrics['p99_ms']}ms > baseline {base['p99_ms']}ms")
+        if metrics["peak_kb_per_doc"] > base["peak_kb_per_doc"] * (1 + MEMORY_TOLERANCE):
+            regressions.append(f"{name}: peak {metrics['peak_kb_per_doc']}KB > baseline {base['peak_kb_per_doc']}KB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume parser throughput benchmark")
+    parser.add_argument("--docs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.docs, args.seed)
+
+    print(f"{'benchmark':32} {'docs/sec':>10} {'p50 ms':>10} {'p99 ms':>10} {'peak KB':>10}")
+    for name, m in results.items():
+        if name.startswith("_"):
+            continue
+        print(f"{name:32} {m['docs_per_sec']:>10} {m['p50_ms']:>10} {m['p99_ms']:>10} {m['peak_kb_per_doc']:>10}")
+    print(f"Process peak RSS: {results['_meta']['process_peak_rss_mb']} MB")
+
+    if args.update_baseline:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {BASELINE_FILE}")
+        return
+
+    if not os.path.exists(BASELINE_FILE):
+        print("No baseline found. Run with --update-baseline to create one.")
+        return
+
+    with open(BASELINE_FILE) as f:
+        baseline = json.load(f)
+
+    if baseline.get("_meta", {}).get("docs") != args.docs or baseline.get("_meta", {}).get("seed") != args.seed:
+        print("WARNING: baseline was recorded with a different corpus (docs/seed)")
+
+    regressions = compare(results, baseline)
+    if regressions:
+        print("REGRESSIONS:")
+        for r in regressions:
+            print(f"  {r}")
+        sys.exit(1)
+    print("SUCCESS: No regressions against baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Run from backend/: python -m pytest tests
+# (the test_*.py scripts next to app/ exercise a running server instead)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
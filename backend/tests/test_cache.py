@@ -0,0 +1,94 @@
+import asyncio
+import types
+import pytest
+from app.core import cache as cache_module
+from app.core.cache import TieredCache, estimate_size
+from app.core.config import settings
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    # Only the cache's view of time: the event loop keeps the real clock
+    monkeypatch.setattr(cache_module, "time", types.SimpleNamespace(monotonic=clock))
+    monkeypatch.setattr(settings, "HOT_CACHE_ENABLED", True)
+    return clock
+
+def make_cache(max_bytes=10_000_000):
+    cache = TieredCache(max_bytes)
+    cache.namespace("jobs", ttl=60, negative_ttl=5)
+    return cache
+
+def test_values_expire_after_ttl(clock):
+    cache = make_cache()
+    cache.set("jobs", "python", ["a", "b"])
+
+    assert cache.get("jobs", "python") == (True, ["a", "b"])
+    clock.now += 61
+    assert cache.get("jobs", "python") == (False, None)
+    assert cache.size == 0
+
+def test_empty_results_use_negative_ttl(clock):
+    cache = make_cache()
+    cache.set("jobs", "nothing", [])
+
+    clock.now += 4
+    assert cache.get("jobs", "nothing") == (True, [])
+    clock.now += 2
+    assert cache.get("jobs", "nothing") == (False, None)
+
+def test_least_recently_used_entry_is_evicted_first(clock):
+    value = ["x" * 100]
+    # Room for four entries (each stays under MAX_ENTRY_FRACTION)
+    cache = make_cache(max_bytes=int(estimate_size(value) * 4.5))
+    for key in "abcd":
+        cache.set("jobs", key, list(value))
+    cache.get("jobs", "a")
+
+    cache.set("jobs", "e", list(value))
+
+    assert not cache.get("jobs", "b")[0]
+    assert all(cache.get("jobs", key)[0] for key in "acde")
+    assert cache.size <= cache.max_bytes
+
+def test_oversized_value_is_not_kept(clock):
+    cache = make_cache(max_bytes=1000)
+    cache.set("jobs", "huge", ["x" * 1000])
+
+    assert cache.get("jobs", "huge") == (False, None)
+    assert cache.size == 0
+
+def test_invalidate_drops_keys_with_prefix(clock):
+    cache = make_cache()
+    for key in ("python|0|10", "python|10|10", "pythonista|0|10"):
+        cache.set("jobs", key, [key])
+
+    cache.invalidate("jobs", "python|")
+
+    assert not cache.get("jobs", "python|0|10")[0]
+    assert not cache.get("jobs", "python|10|10")[0]
+    assert cache.get("jobs", "pythonista|0|10")[0]
+
+def test_concurrent_misses_share_one_load(clock):
+    cache = make_cache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["job"]
+
+    async def main():
+        results = await asyncio.gather(*[cache.get_or_load("jobs", "python", loader) for _ in range(5)])
+        # Later reads are hits
+        results.append(await cache.get_or_load("jobs", "python", loader))
+        return results
+
+    assert asyncio.run(main()) == [["job"]] * 6
+    assert len(calls) == 1
@@ -0,0 +1,106 @@
+from app.services.job_sources.deduplicate import Deduplicator
+from app.services.job_sources.normalize import normalize_job_data
+from app.utils import minhash
+from app.utils.minhash import JobSketch, jaccard, signature, similarity
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to build and operate our payment APIs. "
+    "You will design services in Python, own their reliability in production and "
+    "work closely with product on new features for merchants across Europe."
+)
+
+def make_job(job_id, source, title="Senior Python Developer", company="Acme", link=None, description=DESCRIPTION):
+    return normalize_job_data(
+        job_id=job_id,
+        title=title,
+        company=company,
+        location="Remote",
+        description=description,
+        apply_link=link or f"https://jobs.example.com/{job_id}",
+        source=source,
+    )
+
+def test_lower_priority_duplicate_is_rejected():
+    dedupe = Deduplicator()
+    assert dedupe.add(make_job("api-1", "api", link="https://acme.com/1")) == (True, [])
+
+    accepted, replaced = dedupe.add(make_job("hn-1", "hn", link="https://acme.com/1"))
+
+    assert not accepted and replaced == []
+    assert [job.job_id for job in dedupe.jobs()] == ["api-1"]
+
+def test_higher_priority_copy_takes_the_earlier_place():
+    dedupe = Deduplicator()
+    dedupe.add(make_job("hn-1", "hn", link="https://acme.com/1"))
+    dedupe.add(make_job("wwr-2", "wwr", title="Data Engineer", company="Other", description="Spark and Airflow pipelines."))
+
+    accepted, replaced = dedupe.add(make_job("api-1", "api", link="https://acme.com/1"))
+
+    assert accepted
+    assert [job.job_id for job in replaced] == ["hn-1"]
+    # Same position as the copy it replaced, not appended
+    assert [job.job_id for job in dedupe.jobs()] == ["api-1", "wwr-2"]
+
+def test_order_of_arrival_does_not_change_the_result():
+    jobs = [
+        make_job("hn-1", "hn", link="https://acme.com/1"),
+        make_job("remoteok-1", "remoteok", link="https://acme.com/1?utm_source=feed"),
+        make_job("api-1", "api", link="https://acme.com/1"),
+    ]
+    for order in (jobs, list(reversed(jobs))):
+        dedupe = Deduplicator()
+        for job in order:
+            dedupe.add(job)
+        assert [job.job_id for job in dedupe.jobs()] == ["api-1"]
+
+def test_abbreviated_title_matches_on_title_and_company():
+    dedupe = Deduplicator()
+    dedupe.add(make_job("wwr-1", "wwr", title="Senior Python Developer", description="one"))
+
+    accepted, _ = dedupe.add(make_job("hn-1", "hn", title="Sr. Python Dev", description="two"))
+
+    assert not accepted
+
+def test_near_duplicate_content_with_other_link_is_merged():
+    dedupe = Deduplicator()
+    # Different link and title key: only MinHash/LSH can match them
+    dedupe.add(make_job("wwr-1", "wwr", title="Senior Python Developer, Payments Team"))
+
+    accepted, _ = dedupe.add(make_job("remoteok-9", "remoteok", title="Senior Python Developer Payments"))
+
+    assert not accepted
+
+def test_same_template_for_another_role_is_kept():
+    # Shared boilerplate description, different title: not a duplicate
+    dedupe = Deduplicator()
+    dedupe.add(make_job("wwr-1", "wwr", title="Senior Python Developer"))
+
+    accepted, _ = dedupe.add(make_job("wwr-2", "wwr", title="Frontend Designer"))
+
+    assert accepted
+    assert len(dedupe) == 2
+
+def test_minhash_similarity_tracks_overlap():
+    same = JobSketch.from_job("Python Developer", "Acme", DESCRIPTION)
+    copy = JobSketch.from_job("Python Developer", "Acme", DESCRIPTION)
+    other = JobSketch.from_job("Nurse", "Hospital", "Night shifts in the intensive care unit, patient care.")
+
+    assert similarity(same.signature, copy.signature) == 1.0
+    assert same.is_near_duplicate(copy)
+    assert similarity(same.signature, other.signature) < 0.2
+    assert not same.is_near_duplicate(other)
+
+def test_minhash_signature_does_not_wrap_around():
+    shingles = [0, 1, 0xFFFFFFFF, 0xDEADBEEF]
+    prime = int(minhash._MERSENNE_PRIME)
+    # Same universal hashes in Python integers, which cannot overflow
+    expected = [
+        min((int(a) * x + int(b)) % prime for x in shingles)
+        for a, b in zip(minhash._PERM_A, minhash._PERM_B)
+    ]
+
+    assert signature(shingles) == expected
+
+def test_jaccard():
+    assert jaccard({"a", "b"}, {"b", "c"}) == 1 / 3
+    assert jaccard(set(), set()) == 1.0
@@ -0,0 +1,38 @@
+import asyncio
+from datetime import datetime
+from app.models.hybrid_job import HybridJob
+from app.services.job_sources import merge_jobs
+from app.services.job_sources.normalize import job_fingerprint
+
+def make_job(job_id: str, day: int, description: str = "") -> HybridJob:
+    return HybridJob(
+        job_id=job_id, title="Backend Engineer", company="Acme", location="Remote",
+        description=description, apply_link="https://acme.example/jobs/1?utm_source=x",
+        source="remoteok", published_at=datetime(2024, 1, day)
+    )
+
+def test_stored_entry_and_response_list_the_same_jobs(monkeypatch):
+    entries = []
+
+    class Collection:
+        async def update_one(self, query, update, upsert=False):
+            entries.append(update["$set"])
+
+    async def keep_all(jobs, priorities, sketches=None):
+        return jobs
+
+    async def save_jobs(jobs):
+        return [job_fingerprint(job) for job in jobs]
+
+    monkeypatch.setattr(merge_jobs, "merge_reposts", keep_all)
+    monkeypatch.setattr(merge_jobs, "save_jobs", save_jobs)
+    monkeypatch.setattr(merge_jobs.database, "get_collection", lambda name: Collection())
+    monkeypatch.setattr(merge_jobs, "invalidate_hot_entries", lambda key: None)
+
+    # Same posting fetched twice with different descriptions: one store id
+    jobs = [make_job("a", 1, "old"), make_job("b", 3, "new")]
+    stored = asyncio.run(merge_jobs._store_results("q", jobs, ["remoteok"], []))
+
+    assert [job.job_id for job in stored] == ["b"]
+    assert entries[0]["job_ids"] == [job_fingerprint(stored[0])]
+    assert entries[0]["total"] == len(stored)
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from app.utils.pagination import cursor_for, decode_cursor, encode_cursor, page_meta, seek_filter
+
+SORT = [("updated_at", -1), ("_id", -1)]
+
+def test_cursor_round_trip_keeps_types():
+    values = {"updated_at": datetime(2024, 5, 1, 12, 30), "_id": ObjectId(), "q": "abc"}
+
+    assert decode_cursor(encode_cursor(values)) == values
+
+def test_cursor_has_no_padding():
+    assert "=" not in encode_cursor({"_id": 1})
+
+@pytest.mark.parametrize("token", ["not a cursor", "abc", "WzFd"])
+def test_invalid_cursor_raises_value_error(token):
+    # "WzFd" is valid base64 JSON, but a list ([1]) instead of seek values
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+def test_cursor_for_takes_the_sort_fields():
+    doc = {"_id": 7, "updated_at": datetime(2024, 1, 1), "status": "applied"}
+
+    assert decode_cursor(cursor_for(doc, SORT, q="k")) == {"updated_at": datetime(2024, 1, 1), "_id": 7, "q": "k"}
+
+def test_seek_filter_single_field():
+    assert seek_filter([("_id", 1)], {"_id": 5}) == {"_id": {"$gt": 5}}
+
+def test_seek_filter_compound_sort():
+    after = {"updated_at": datetime(2024, 1, 1), "_id": 9}
+
+    assert seek_filter(SORT, after) == {"$or": [
+        {"updated_at": {"$lt": after["updated_at"]}},
+        {"updated_at": after["updated_at"], "_id": {"$lt": 9}},
+    ]}
+
+def test_keyset_walk_returns_every_document_once():
+    mongomock = pytest.importorskip("mongomock")
+    collection = mongomock.MongoClient().db.items
+    start = datetime(2024, 1, 1)
+    # Many ties on updated_at: _id breaks them
+    collection.insert_many([{"_id": i, "updated_at": start + timedelta(minutes=i // 4)} for i in range(23)])
+
+    seen, after = [], None
+    while True:
+        query = seek_filter(SORT, after) if after else {}
+        page = list(collection.find(query).sort(SORT).limit(5))
+        seen.extend(doc["_id"] for doc in page)
+        if len(page) < 5:
+            break
+        after = decode_cursor(cursor_for(page[-1], SORT))
+
+    expected = [doc["_id"] for doc in collection.find().sort(SORT)]
+    assert seen == expected
+    assert len(set(seen)) == 23
+
+def test_page_meta():
+    assert page_meta("abc") == {"next_cursor": "abc"}
+    assert page_meta(None, total=21, page=2, limit=10) == {
+        "next_cursor": None, "page": 2, "limit": 10, "total": 21, "total_pages": 3
+    }
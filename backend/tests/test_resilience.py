@@ -0,0 +1,171 @@
+import asyncio
+import httpx
+import pytest
+from app.core import http_client, resilience
+from app.core.resilience import CircuitBreaker, SourceUnavailable
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    # Breakers, buckets and ledgers are per process; start each test clean
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "_buckets", {})
+    monkeypatch.setattr(resilience, "_ledgers", {})
+
+def open_breaker(source: str) -> CircuitBreaker:
+    # Opened long enough ago that the next request is the half-open trial
+    breaker = resilience.get_breaker(source)
+    breaker.state = CircuitBreaker.OPEN
+    breaker.opened_at = -1e9
+    return breaker
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+def test_half_open_breaker_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+def test_failed_trial_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=5, cooldown=0)
+    for _ in range(5):
+        breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.trial_in_flight
+
+def test_rate_limited_request_does_not_claim_the_trial():
+    breaker = open_breaker("hn")
+    resilience.get_bucket("hn").tokens = 0
+
+    with pytest.raises(SourceUnavailable):
+        asyncio.run(resilience.before_request("hn"))
+
+    assert not breaker.trial_in_flight
+    assert breaker.ready()
+
+def test_ledger_error_does_not_leave_the_trial_stuck(monkeypatch):
+    class BrokenLedger:
+        async def try_consume(self):
+            raise RuntimeError("mongo down")
+
+    breaker = open_breaker("jsearch")
+    monkeypatch.setattr(resilience, "get_ledger", lambda source: BrokenLedger())
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(resilience.before_request("jsearch"))
+
+    assert not breaker.trial_in_flight
+
+def test_quota_refusal_does_not_claim_the_trial(monkeypatch):
+    class EmptyLedger:
+        async def try_consume(self):
+            return None
+
+    breaker = open_breaker("jsearch")
+    monkeypatch.setattr(resilience, "get_ledger", lambda source: EmptyLedger())
+
+    with pytest.raises(SourceUnavailable):
+        asyncio.run(resilience.before_request("jsearch"))
+
+    assert not breaker.trial_in_flight
+
+class AsyncCollection:
+    # Just the awaitable calls QuotaLedger makes, over a mongomock collection
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_one_and_update(self, *args, **kwargs):
+        return self.collection.find_one_and_update(*args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return self.collection.update_one(*args, **kwargs)
+
+def test_ledger_stops_at_the_limit_without_overcharging(monkeypatch):
+    mongomock = pytest.importorskip("mongomock")
+    quota = mongomock.MongoClient().db.api_quota
+    monkeypatch.setattr(resilience.database, "get_collection", lambda name: AsyncCollection(quota))
+    ledger = resilience.QuotaLedger("jsearch", daily_limit=2, monthly_limit=0)
+
+    async def main():
+        return [await ledger.try_consume() for _ in range(3)]
+
+    first, second, refused = asyncio.run(main())
+
+    assert first == second and len(first) == 2
+    assert refused is None
+    assert {doc["_id"]: doc["count"] for doc in quota.find()} == {key: 2 for key in first}
+
+def test_transport_error_refunds_the_charged_quota(monkeypatch):
+    refunded = []
+
+    class RecordingLedger:
+        async def try_consume(self):
+            return ["jsearch:day:2024-01-31", "jsearch:month:2024-01"]
+
+        async def refund(self, keys):
+            refunded.extend(keys)
+
+    def unreachable(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    monkeypatch.setattr(resilience, "get_ledger", lambda source: RecordingLedger())
+
+    async def main():
+        monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(unreachable)))
+        with pytest.raises(httpx.ConnectError):
+            await http_client.get("jsearch", "https://jsearch.p.rapidapi.com/search")
+
+    asyncio.run(main())
+
+    # The keys taken when the call started, not recomputed afterwards
+    assert refunded == ["jsearch:day:2024-01-31", "jsearch:month:2024-01"]
+
+def test_cancelled_trial_request_releases_the_trial(monkeypatch):
+    async def never_answers(request):
+        await asyncio.sleep(10)
+        return httpx.Response(200)
+
+    breaker = open_breaker("hn")
+
+    async def main():
+        monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(never_answers)))
+        request = asyncio.create_task(http_client.get("hn", "https://news.ycombinator.com/jobs"))
+        await asyncio.sleep(0.01)
+        assert breaker.trial_in_flight
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+
+    asyncio.run(main())
+
+    assert not breaker.trial_in_flight
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+def test_trial_response_closes_the_breaker(monkeypatch):
+    breaker = open_breaker("hn")
+
+    async def main():
+        monkeypatch.setattr(http_client, "_client", httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200))))
+        return await http_client.get("hn", "https://news.ycombinator.com/jobs")
+
+    assert asyncio.run(main()).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+from app.services.resume_reparser import derive_fields, user_overrides
+
+RESUME = """Jane Doe
+Skills
+Python, Docker, AWS, SQL, React, Git, Kubernetes, PostgreSQL
+Experience
+Backend engineer at Acme 2020-2024
+Education
+BSc Computer Science
+"""
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def skills_with_hash_seed(seed: str) -> str:
+    # /parse and /save may run in different workers, each with its own seed
+    code = (
+        "import sys; from app.services.resume_parser import extract_skills; "
+        "print(extract_skills(sys.stdin.read()))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        input=RESUME, capture_output=True, text=True, check=True,
+        cwd=BACKEND, env={**os.environ, "PYTHONHASHSEED": seed}
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+def test_skills_do_not_depend_on_the_hash_seed():
+    assert skills_with_hash_seed("1") == skills_with_hash_seed("2")
+
+def test_unedited_resume_has_no_overrides_in_any_skill_order():
+    derived = derive_fields(RESUME)
+    saved = {**derived, "skills": list(reversed(derived["skills"]))}
+
+    assert user_overrides(saved, derived) == []
+
+def test_edited_fields_are_overrides():
+    derived = derive_fields(RESUME)
+    saved = {**derived, "skills": derived["skills"] + ["Rust"], "education": []}
+
+    assert user_overrides(saved, derived) == ["skills", "education"]
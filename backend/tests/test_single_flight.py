@@ -0,0 +1,53 @@
+import asyncio
+from app.utils.single_flight import SingleFlight
+
+def test_single_flight_coalesces_and_cleans_up():
+    flight = SingleFlight("test")
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def main():
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(3)])
+        assert not flight.is_running("key")
+        return results, await flight.do("key", work)
+
+    results, again = asyncio.run(main())
+    assert results == [1, 1, 1]
+    assert again == 2
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("source down")
+
+    async def main():
+        return await asyncio.gather(*[flight.do("key", fail) for _ in range(2)], return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not flight.is_running("key")
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    flight = SingleFlight("test")
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await leader, waiter
+
+    result, waiter = asyncio.run(main())
+    assert result == "done"
+    assert waiter.cancelled()